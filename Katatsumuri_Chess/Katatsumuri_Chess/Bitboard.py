@@ -0,0 +1,113 @@
+"""
+This file is part of Katatsumuri_Chess
+
+Copyright (c) 2022 YuaHyodo
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+from .Pieces import*
+
+#マスの番号: squares[i][j] -> i * 8 + j (a8 = 0, h8 = 7, a1 = 56, h1 = 63)
+
+BB_EMPTY = 0
+BB_ALL = 0xFFFFFFFFFFFFFFFF
+BB_SQUARES = [1 << sq for sq in range(64)]
+BB_RANKS = [0xFF << (8 * i) for i in range(8)]#BB_RANKS[0]は8段目
+BB_FILES = [0x0101010101010101 << j for j in range(8)]
+
+SQUARE_NAMES = [f + str(8 - i) for i in range(8) for f in 'abcdefgh']
+SQUARE_INDEX = {name: sq for sq, name in enumerate(SQUARE_NAMES)}
+
+ROOK_DIRECTIONS = ((-1, 0), (0, 1), (1, 0), (0, -1))
+BISHOP_DIRECTIONS = ((-1, -1), (-1, 1), (1, 1), (1, -1))
+DIRECTIONS = ROOK_DIRECTIONS + BISHOP_DIRECTIONS#0-3: 縦横, 4-7: 斜め
+
+try:
+    popcount = int.bit_count
+except AttributeError:
+    def popcount(bb):
+        return bin(bb).count('1')
+
+def lsb(bb):
+    return (bb & -bb).bit_length() - 1
+
+def scan(bb):
+    while bb:
+        b = bb & -bb
+        yield b.bit_length() - 1
+        bb ^= b
+
+def step_attacks(offsets):
+    table = []
+    for sq in range(64):
+        i, j = sq // 8, sq % 8
+        bb = 0
+        for di, dj in offsets:
+            if 0 <= i + di <= 7 and 0 <= j + dj <= 7:
+                bb |= BB_SQUARES[(i + di) * 8 + j + dj]
+        table.append(bb)
+    return table
+
+def ray_table(di, dj):
+    table = []
+    for sq in range(64):
+        i, j = sq // 8 + di, sq % 8 + dj
+        bb = 0
+        while 0 <= i <= 7 and 0 <= j <= 7:
+            bb |= BB_SQUARES[i * 8 + j]
+            i += di
+            j += dj
+        table.append(bb)
+    return table
+
+KNIGHT_ATTACKS = step_attacks(Knight(WHITE).attack_squares)
+KING_ATTACKS = step_attacks(King(WHITE).attack_squares)
+PAWN_ATTACKS = [step_attacks(Pawn(WHITE).attack_squares), step_attacks(Pawn(BLACK).attack_squares)]
+
+#RAYS[d][sq]: sqからd方向に盤端までのマス (sq自身は含まない)
+RAYS = [ray_table(di, dj) for di, dj in DIRECTIONS]
+#番号が増える方向なら一番近いマスはlsb, 減る方向ならmsb
+RAY_FORWARD = [di * 8 + dj > 0 for di, dj in DIRECTIONS]
+
+def first_square(d, bb):
+    if RAY_FORWARD[d]:
+        return (bb & -bb).bit_length() - 1
+    return bb.bit_length() - 1
+
+def ray_attacks(sq, occupied, d):
+    ray = RAYS[d][sq]
+    blockers = ray & occupied
+    if blockers:
+        ray ^= RAYS[d][first_square(d, blockers)]
+    return ray
+
+def rook_attacks(sq, occupied):
+    return (ray_attacks(sq, occupied, 0) | ray_attacks(sq, occupied, 1) |
+            ray_attacks(sq, occupied, 2) | ray_attacks(sq, occupied, 3))
+
+def bishop_attacks(sq, occupied):
+    return (ray_attacks(sq, occupied, 4) | ray_attacks(sq, occupied, 5) |
+            ray_attacks(sq, occupied, 6) | ray_attacks(sq, occupied, 7))
+
+def sliding_attacks(sq, occupied, directions):
+    bb = 0
+    for direction in directions:
+        bb |= ray_attacks(sq, occupied, DIRECTIONS.index(direction))
+    return bb
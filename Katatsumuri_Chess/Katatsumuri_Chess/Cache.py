@@ -0,0 +1,91 @@
+"""
+This file is part of Katatsumuri_Chess
+
+Copyright (c) 2022 YuaHyodo
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+from collections import OrderedDict
+
+class LRUCache:
+    def __init__(self, maxsize=65536):
+        self.maxsize = maxsize
+        self.data = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self.data)
+
+    def get(self, key):
+        value = self.data.get(key)
+        if value == None:
+            self.misses += 1
+            return None
+        self.data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key, value):
+        self.data[key] = value
+        self.data.move_to_end(key)
+        if len(self.data) > self.maxsize:
+            self.data.popitem(last=False)
+        return
+
+    def clear(self):
+        self.data.clear()
+        self.hits = 0
+        self.misses = 0
+        return
+
+class PerftTable:
+    #replace='depth': 深い方を残す, replace='always': 常に上書き
+    def __init__(self, size=1 << 20, replace='depth'):
+        if replace not in ('depth', 'always'):
+            raise ValueError('unknown replace policy: ' + str(replace))
+        self.size = size
+        self.replace = replace
+        self.keys = [0] * size
+        self.depths = [-1] * size
+        self.nodes = [0] * size
+        self.hits = 0
+
+    def get(self, key, depth):
+        index = key % self.size
+        if self.keys[index] == key and self.depths[index] == depth:
+            self.hits += 1
+            return self.nodes[index]
+        return None
+
+    def put(self, key, depth, nodes):
+        index = key % self.size
+        if self.replace == 'always' or self.depths[index] <= depth:
+            self.keys[index] = key
+            self.depths[index] = depth
+            self.nodes[index] = nodes
+        return
+
+    def clear(self):
+        self.keys = [0] * self.size
+        self.depths = [-1] * self.size
+        self.nodes = [0] * self.size
+        self.hits = 0
+        return
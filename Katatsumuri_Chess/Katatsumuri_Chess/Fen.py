@@ -0,0 +1,124 @@
+"""
+This file is part of Katatsumuri_Chess
+
+Copyright (c) 2022 YuaHyodo
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+from collections import namedtuple
+
+from .Pieces import*
+from .Bitboard import*
+from .Cache import LRUCache
+
+#駒コード: 色 * 6 + 駒の種類 (P, N, B, R, Q, K)
+PIECE_SYMBOLS = 'PNBRQKpnbrqk'
+#キャスリング権: 1 = K, 2 = Q, 4 = k, 8 = q
+CASTLING_SYMBOLS = 'KQkq'
+CASTLING_STRINGS = [''.join(CASTLING_SYMBOLS[i] for i in range(4) if rights & (1 << i)) or '-' for rights in range(16)]
+
+#数字を空きマス('.')に展開する
+EXPAND_TABLE = str.maketrans({str(n): '.' * n for n in range(1, 9)})
+#正しい文字を全部消す. 何か残れば不正なFEN
+INVALID_TABLE = str.maketrans('', '', '.' + PIECE_SYMBOLS)
+#PIECE_MASK_TABLES[code]: その駒だけ'1', 他は'0'にする
+PIECE_MASK_TABLES = [str.maketrans({c: ('1' if c == symbol else '0') for c in '.' + PIECE_SYMBOLS}) for symbol in PIECE_SYMBOLS]
+
+Position = namedtuple('Position', ['pieces_bb', 'turn', 'castling_rights', 'ep_square', 'halfmove', 'fullmove'])
+
+FEN_CACHE = LRUCache(4096)
+
+def parse_fen(fen):
+    position = FEN_CACHE.get(fen)
+    if position == None:
+        position = parse_fen_uncached(fen)
+        FEN_CACHE.put(fen, position)
+    return position
+
+def is_valid_ep_square(pieces_bb, turn, ep_square):
+    #アンパッサンのマスは空いていて, その先に直前に2マス進んだ相手のポーンがいる
+    occupied = 0
+    for bb in pieces_bb:
+        occupied |= bb
+    if occupied & BB_SQUARES[ep_square]:
+        return False
+    if turn == WHITE:
+        return ep_square // 8 == 2 and pieces_bb[6 + PAWN] & BB_SQUARES[ep_square + 8] != 0
+    return ep_square // 8 == 5 and pieces_bb[PAWN] & BB_SQUARES[ep_square - 8] != 0
+
+def parse_fen_uncached(fen):
+    fields = fen.split()
+    if len(fields) == 4:
+        fields += ['0', '1']
+    if len(fields) != 6:
+        raise ValueError('invalid fen: ' + repr(fen))
+    ranks = fields[0].translate(EXPAND_TABLE).split('/')
+    if len(ranks) != 8 or min(len(rank) for rank in ranks) != 8 or max(len(rank) for rank in ranks) != 8:
+        raise ValueError('invalid fen: ' + repr(fen))
+    placement = ''.join(ranks)
+    if placement.translate(INVALID_TABLE) != '':
+        raise ValueError('invalid fen: ' + repr(fen))
+    #文字列を反転して2進数として読むと, i文字目がi番目のbitになる
+    placement = placement[::-1]
+    pieces_bb = tuple(int(placement.translate(PIECE_MASK_TABLES[code]), 2) if PIECE_SYMBOLS[code] in placement else 0
+                      for code in range(12))
+
+    if fields[1] == 'w':
+        turn = WHITE
+    elif fields[1] == 'b':
+        turn = BLACK
+    else:
+        raise ValueError('invalid fen: ' + repr(fen))
+    castling_rights = 0
+    if fields[2] != '-':
+        for c in fields[2]:
+            if c not in CASTLING_SYMBOLS:
+                raise ValueError('invalid fen: ' + repr(fen))
+            castling_rights |= 1 << CASTLING_SYMBOLS.index(c)
+    ep_square = None
+    if fields[3] != '-':
+        if fields[3] not in SQUARE_INDEX:
+            raise ValueError('invalid fen: ' + repr(fen))
+        ep_square = SQUARE_INDEX[fields[3]]
+        if not is_valid_ep_square(pieces_bb, turn, ep_square):
+            raise ValueError('invalid fen: ' + repr(fen))
+    return Position(pieces_bb, turn, castling_rights, ep_square, int(fields[4]), int(fields[5]))
+
+def rank_to_fen(pieces_bb, i):
+    cells = ['.'] * 8
+    for code in range(12):
+        bits = (pieces_bb[code] >> (i * 8)) & 0xFF
+        while bits:
+            b = bits & -bits
+            cells[b.bit_length() - 1] = PIECE_SYMBOLS[code]
+            bits ^= b
+    rank = ''
+    c = 0
+    for cell in cells:
+        if cell == '.':
+            c += 1
+        else:
+            if c != 0:
+                rank += str(c)
+                c = 0
+            rank += cell
+    if c != 0:
+        rank += str(c)
+    return rank
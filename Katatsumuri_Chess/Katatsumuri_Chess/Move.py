@@ -0,0 +1,63 @@
+"""
+This file is part of Katatsumuri_Chess
+
+Copyright (c) 2022 YuaHyodo
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+from .Pieces import*
+from .Bitboard import*
+
+#16bitの指し手: 0-5bit 移動先, 6-11bit 移動元, 12-13bit 成る駒(N, B, R, Q), 14-15bit 種類
+NORMAL = 0
+PROMOTION = 1 << 14
+EN_PASSANT = 2 << 14
+CASTLING = 3 << 14
+FLAG_MASK = 3 << 14
+
+PROMOTION_SYMBOLS = 'pnbrqk'
+
+def encode_move(from_sq, to_sq, promotion=None, flag=NORMAL):
+    if promotion != None:
+        #成れるのはN, B, R, Qだけ
+        if not KNIGHT <= promotion <= QUEEN:
+            raise ValueError('invalid promotion piece: ' + str(promotion))
+        return PROMOTION | ((promotion - KNIGHT) << 12) | (from_sq << 6) | to_sq
+    return flag | (from_sq << 6) | to_sq
+
+def move_from_sq(move):
+    return (move >> 6) & 63
+
+def move_to_sq(move):
+    return move & 63
+
+def move_flag(move):
+    return move & FLAG_MASK
+
+def move_promotion(move):
+    if move & FLAG_MASK == PROMOTION:
+        return ((move >> 12) & 3) + KNIGHT
+    return None
+
+def int_to_uci(move):
+    uci = SQUARE_NAMES[(move >> 6) & 63] + SQUARE_NAMES[move & 63]
+    if move & FLAG_MASK == PROMOTION:
+        uci += PROMOTION_SYMBOLS[((move >> 12) & 3) + KNIGHT]
+    return uci
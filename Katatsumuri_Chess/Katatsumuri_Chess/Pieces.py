@@ -26,78 +26,112 @@ SOFTWARE.
 WHITE = 'WHITE'
 BLACK = 'BLACK'
 
+PAWN, KNIGHT, BISHOP, ROOK, QUEEN, KING = range(6)
+#駒の価値(センチポーン). キングは0
+PIECE_VALUES = (100, 320, 330, 500, 900, 0)
+
 class Base:
-    def __init__(self):
-        self.color = None
-        self.attack_squares = []
-        self.symbol = ['', '']
+    #駒は(種類, 色)ごとに1つだけ作って共有する. 変更はできない
+    __slots__ = ('color', 'attack_squares', 'symbol', 'piece_type', 'code')
+    instances = {}
+    PIECE_TYPE = None
+    WHITE_ATTACK_SQUARES = ()
+    BLACK_ATTACK_SQUARES = ()
+    SYMBOL = ('', '')
+
+    def __new__(cls, color=None):
+        piece = Base.instances.get((cls, color))
+        if piece == None:
+            piece = object.__new__(cls)
+            object.__setattr__(piece, 'color', color)
+            if color == BLACK:
+                object.__setattr__(piece, 'attack_squares', cls.BLACK_ATTACK_SQUARES)
+            else:
+                object.__setattr__(piece, 'attack_squares', cls.WHITE_ATTACK_SQUARES)
+            object.__setattr__(piece, 'symbol', cls.SYMBOL)
+            object.__setattr__(piece, 'piece_type', cls.PIECE_TYPE)
+            code = None
+            if cls.PIECE_TYPE != None and color in (WHITE, BLACK):
+                code = cls.PIECE_TYPE + 6 * (color == BLACK)
+            object.__setattr__(piece, 'code', code)
+            Base.instances[(cls, color)] = piece
+        return piece
+
+    def __init__(self, color=None):
+        pass
+
+    def __setattr__(self, name, value):
+        raise AttributeError('pieces are immutable')
+
+    def __delattr__(self, name):
+        raise AttributeError('pieces are immutable')
+
+    def __reduce__(self):
+        return (type(self), (self.color,))
+
+    def __repr__(self):
+        return type(self).__name__ + '(' + repr(self.color) + ')'
 
 class Pawn(Base):
-    def __init__(self, color):
-        super().__init__()
-        self.color = color
-        if self.color == WHITE:
-            self.attack_squares = ((-1, -1), (-1, 1))
-        else:
-            self.attack_squares = ((1, -1), (1, 1))
-        self.symbol = ['P', 'p']
+    __slots__ = ()
+    PIECE_TYPE = PAWN
+    WHITE_ATTACK_SQUARES = ((-1, -1), (-1, 1))
+    BLACK_ATTACK_SQUARES = ((1, -1), (1, 1))
+    SYMBOL = ('P', 'p')
 
 class Knight(Base):
-    def __init__(self, color):
-        super().__init__()
-        self.color = color
-        self.attack_squares = ((-2, -1), (-2, 1),
-                                          (-1, 2),  (1, 2),
-                                          (2, 1),    (2, -1),
-                                          (1, -2),   (-1, -2))
-        self.symbol = ['N', 'n']
+    __slots__ = ()
+    PIECE_TYPE = KNIGHT
+    WHITE_ATTACK_SQUARES = ((-2, -1), (-2, 1),
+                            (-1, 2),  (1, 2),
+                            (2, 1),    (2, -1),
+                            (1, -2),   (-1, -2))
+    BLACK_ATTACK_SQUARES = WHITE_ATTACK_SQUARES
+    SYMBOL = ('N', 'n')
 
 class Bishop(Base):
-    def __init__(self, color):
-        super().__init__()
-        self.color = color
-        self.attack_squares = ((-1, -1), (-2, -2), (-3, -3), (-4, -4), (-5, -5), (-6, -6), (-7, -7),
-                               (-1, 1), (-2, 2), (-3, 3), (-4, 4), (-5, 5), (-6, 6), (-7, 7),
-                               (1, 1), (2, 2), (3, 3), (4, 4), (5, 5), (6, 6), (7, 7),
-                               (1, -1), (2, -2), (3, -3), (4, -4), (5, -5), (6, -6), (7, -7))
-        self.symbol = ['B', 'b']
+    __slots__ = ()
+    PIECE_TYPE = BISHOP
+    WHITE_ATTACK_SQUARES = ((-1, -1), (-2, -2), (-3, -3), (-4, -4), (-5, -5), (-6, -6), (-7, -7),
+                            (-1, 1), (-2, 2), (-3, 3), (-4, 4), (-5, 5), (-6, 6), (-7, 7),
+                            (1, 1), (2, 2), (3, 3), (4, 4), (5, 5), (6, 6), (7, 7),
+                            (1, -1), (2, -2), (3, -3), (4, -4), (5, -5), (6, -6), (7, -7))
+    BLACK_ATTACK_SQUARES = WHITE_ATTACK_SQUARES
+    SYMBOL = ('B', 'b')
 
 class Rook(Base):
-    def __init__(self, color):
-        super().__init__()
-        self.color = color
-        self.attack_squares = ((-1, 0), (-2, 0), (-3, 0), (-4, 0), (-5, 0), (-6, 0), (-7, 0),
-                               (0, 1), (0, 2), (0, 3), (0, 4), (0, 5), (0, 6), (0, 7),
-                               (1, 0), (2, 0), (3, 0), (4, 0), (5, 0), (6, 0), (7, 0),
-                               (0, -1), (0, -2), (0, -3), (0, -4), (0, -5), (0, -6), (0, -7))
-        self.symbol = ['R', 'r']
+    __slots__ = ()
+    PIECE_TYPE = ROOK
+    WHITE_ATTACK_SQUARES = ((-1, 0), (-2, 0), (-3, 0), (-4, 0), (-5, 0), (-6, 0), (-7, 0),
+                            (0, 1), (0, 2), (0, 3), (0, 4), (0, 5), (0, 6), (0, 7),
+                            (1, 0), (2, 0), (3, 0), (4, 0), (5, 0), (6, 0), (7, 0),
+                            (0, -1), (0, -2), (0, -3), (0, -4), (0, -5), (0, -6), (0, -7))
+    BLACK_ATTACK_SQUARES = WHITE_ATTACK_SQUARES
+    SYMBOL = ('R', 'r')
 
 class Queen(Base):
-    def __init__(self, color):
-        super().__init__()
-        self.color = color
-        self.attack_squares = ((-1, -1), (-2, -2), (-3, -3), (-4, -4), (-5, -5), (-6, -6), (-7, -7),
-                               (-1, 1), (-2, 2), (-3, 3), (-4, 4), (-5, 5), (-6, 6), (-7, 7),
-                               (1, 1), (2, 2), (3, 3), (4, 4), (5, 5), (6, 6), (7, 7),
-                               (1, -1), (2, -2), (3, -3), (4, -4), (5, -5), (6, -6), (7, -7),
-                               (-1, 0), (-2, 0), (-3, 0), (-4, 0), (-5, 0), (-6, 0), (-7, 0),
-                               (0, 1), (0, 2), (0, 3), (0, 4), (0, 5), (0, 6), (0, 7),
-                               (1, 0), (2, 0), (3, 0), (4, 0), (5, 0), (6, 0), (7, 0),
-                               (0, -1), (0, -2), (0, -3), (0, -4), (0, -5), (0, -6), (0, -7))
-        self.symbol = ['Q', 'q']
+    __slots__ = ()
+    PIECE_TYPE = QUEEN
+    WHITE_ATTACK_SQUARES = Bishop.WHITE_ATTACK_SQUARES + Rook.WHITE_ATTACK_SQUARES
+    BLACK_ATTACK_SQUARES = WHITE_ATTACK_SQUARES
+    SYMBOL = ('Q', 'q')
 
 class King(Base):
-    def __init__(self, color):
-        super().__init__()
-        self.color = color
-        self.attack_squares = ((-1, -1), (-1, 0), (-1, 1),
-                               (0, -1), (0, 1),
-                               (1, -1), (1, 0), (1, 1))
-        self.symbol = ['K', 'k']
-
-Pawn_type = type(Pawn('a'))
-Knight_type = type(Knight('a'))
-Bishop_type = type(Bishop('a'))
-Rook_type = type(Rook('a'))
-Queen_type = type(Queen('a'))
-King_type = type(King('a'))
+    __slots__ = ()
+    PIECE_TYPE = KING
+    WHITE_ATTACK_SQUARES = ((-1, -1), (-1, 0), (-1, 1),
+                            (0, -1), (0, 1),
+                            (1, -1), (1, 0), (1, 1))
+    BLACK_ATTACK_SQUARES = WHITE_ATTACK_SQUARES
+    SYMBOL = ('K', 'k')
+
+Pawn_type = Pawn
+Knight_type = Knight
+Bishop_type = Bishop
+Rook_type = Rook
+Queen_type = Queen
+King_type = King
+
+PIECE_CLASSES = (Pawn, Knight, Bishop, Rook, Queen, King)
+#PIECES[駒コード] (駒コード = 色 * 6 + 駒の種類)
+PIECES = tuple(cls(color) for color in (WHITE, BLACK) for cls in PIECE_CLASSES)
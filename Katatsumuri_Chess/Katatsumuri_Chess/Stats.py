@@ -0,0 +1,122 @@
+"""
+This file is part of Katatsumuri_Chess
+
+Copyright (c) 2022 YuaHyodo
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+from functools import wraps
+import time
+
+DEFAULT_METHODS = ('legal_moves', 'is_legal', 'is_suiside_move', 'return_attack_squares', 'return_fen', 'set_fen')
+
+class MethodStats:
+    __slots__ = ('calls', 'total', 'max', 'max_fen')
+
+    def __init__(self):
+        self.calls = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.max_fen = None
+
+class Stats:
+    #有効な間だけクラスのメソッドを計測用の関数に置き換えるので, 無効な時は何も影響しない
+    def __init__(self, cls, methods=DEFAULT_METHODS):
+        self.cls = cls
+        self.methods = tuple(methods)
+        self.originals = {}
+        self.data = {}
+        self.reset()
+
+    def __enter__(self):
+        self.enable()
+        return self
+
+    def __exit__(self, *args):
+        self.disable()
+        return False
+
+    @property
+    def enabled(self):
+        return len(self.originals) > 0
+
+    def enable(self):
+        if self.enabled:
+            return
+        for name in self.methods:
+            original = self.cls.__dict__[name]
+            self.originals[name] = original
+            setattr(self.cls, name, self.wrap(name, original))
+        return
+
+    def disable(self):
+        for name, original in self.originals.items():
+            setattr(self.cls, name, original)
+        self.originals = {}
+        return
+
+    def reset(self):
+        for name in self.methods:
+            self.data[name] = MethodStats()
+        return
+
+    def wrap(self, name, func):
+        data = self.data
+        perf_counter = time.perf_counter
+
+        @wraps(func)
+        def wrapper(board, *args, **kwargs):
+            start = perf_counter()
+            returned = False
+            try:
+                result = func(board, *args, **kwargs)
+                returned = True
+                return result
+            finally:
+                elapsed = perf_counter() - start
+                stats = data[name]
+                stats.calls += 1
+                stats.total += elapsed
+                if elapsed > stats.max:
+                    stats.max = elapsed
+                    stats.max_fen = None
+                    if returned:
+                        #例外で終わった時は局面が壊れているかもしれないのでFENは記録しない
+                        stats.max_fen = self.fen_of(board)
+        return wrapper
+
+    def fen_of(self, board):
+        #計測対象にならないように元の関数を呼ぶ
+        try:
+            return self.originals.get('return_fen', self.cls.return_fen)(board)
+        except Exception:
+            return None
+
+    def report(self):
+        return {name: {'calls': stats.calls, 'total': stats.total, 'max': stats.max, 'max_fen': stats.max_fen}
+                for name, stats in self.data.items()}
+
+    def __str__(self):
+        lines = []
+        for name, stats in sorted(self.data.items(), key=lambda item: -item[1].total):
+            average = stats.total / stats.calls if stats.calls > 0 else 0.0
+            lines.append('{:<24} {:>10} calls {:>10.4f}s total {:>10.2f}us avg {:>10.2f}us max  {}'.format(
+                name, stats.calls, stats.total, average * 1e6, stats.max * 1e6, stats.max_fen or ''))
+        return '\n'.join(lines)
@@ -0,0 +1,38 @@
+"""
+This file is part of Katatsumuri_Chess
+
+Copyright (c) 2022 YuaHyodo
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+import random
+
+#乱数の種を固定して, プロセスが違っても同じ局面は同じハッシュ値になるようにする
+_random = random.Random(0x4B617461)
+
+PIECE_KEYS = [[_random.getrandbits(64) for sq in range(64)] for code in range(12)]
+TURN_KEY = _random.getrandbits(64)
+EP_KEYS = [_random.getrandbits(64) for file in range(8)]
+_CASTLING_BIT_KEYS = [_random.getrandbits(64) for i in range(4)]
+CASTLING_KEYS = [0] * 16
+for rights in range(16):
+    for i in range(4):
+        if rights & (1 << i):
+            CASTLING_KEYS[rights] ^= _CASTLING_BIT_KEYS[i]
@@ -23,19 +23,124 @@ SOFTWARE.
 """
 
 from .Pieces import*
+from .Bitboard import*
+from .Zobrist import*
+from .Cache import*
+from .Move import*
+from .Fen import*
+from .Psqt import PSQ_SCORES
+from .planes import boards_to_planes, FEATURE_NAMES
+from .Stats import Stats
+
+from array import array
+from collections import namedtuple
+import struct
 
 WHITE = 'WHITE'
 BLACK = 'BLACK'
+COLORS = (WHITE, BLACK)
+COLOR_INDEX = {WHITE: 0, BLACK: 1}
+
+CASTLING_ROOK_MOVES = {(60, 62): (63, 61), (60, 58): (56, 59), (4, 6): (7, 5), (4, 2): (0, 3)}
+CASTLING_MASKS = [15] * 64
+CASTLING_MASKS[63] = 15 ^ 1
+CASTLING_MASKS[56] = 15 ^ 2
+CASTLING_MASKS[60] = 15 ^ 3
+CASTLING_MASKS[7] = 15 ^ 4
+CASTLING_MASKS[0] = 15 ^ 8
+CASTLING_MASKS[4] = 15 ^ 12
+#(キングの移動元, 移動先, 空いているべきマス, 攻撃されていてはいけないマス)
+CASTLING_PATHS = ((60, 62, BB_SQUARES[61] | BB_SQUARES[62], BB_SQUARES[60] | BB_SQUARES[61] | BB_SQUARES[62]),
+                  (60, 58, BB_SQUARES[57] | BB_SQUARES[58] | BB_SQUARES[59], BB_SQUARES[60] | BB_SQUARES[59] | BB_SQUARES[58]),
+                  (4, 6, BB_SQUARES[5] | BB_SQUARES[6], BB_SQUARES[4] | BB_SQUARES[5] | BB_SQUARES[6]),
+                  (4, 2, BB_SQUARES[1] | BB_SQUARES[2] | BB_SQUARES[3], BB_SQUARES[4] | BB_SQUARES[3] | BB_SQUARES[2]))
+
+Outcome = namedtuple('Outcome', ['check', 'checkmate', 'stalemate', 'fifty_moves',
+                                 'insufficient_material', 'repetition', 'fivefold_repetition', 'winner'])
+
+#バイナリ形式(32バイト): 駒のあるマス(8), 駒コードを4bitずつ(16), 手番とキャスリング権(1),
+#アンパッサンのマス(1, 無ければ255), 50手ルールの手数(2), 手数(4)
+POSITION_STRUCT = struct.Struct('<Q16sBBHI')
+
+class CastlingSides:
+    #CastlingAbility[color]の[キング側, クイーン側]. 書き込むとBoardのcastling_rightsに反映する
+    __slots__ = ('board', 'color')
+
+    def __init__(self, board, color):
+        self.board = board
+        self.color = color
+
+    def bit(self, side):
+        if side not in (0, 1):
+            raise IndexError('castling side must be 0 or 1')
+        return 1 << (2 * self.color + side)
+
+    def __getitem__(self, side):
+        return self.board.castling_rights & self.bit(side) != 0
+
+    def __setitem__(self, side, value):
+        if value:
+            self.board.set_castling_rights(self.board.castling_rights | self.bit(side))
+        else:
+            self.board.set_castling_rights(self.board.castling_rights & ~self.bit(side))
+        return
+
+    def __len__(self):
+        return 2
+
+    def __iter__(self):
+        return iter([self[0], self[1]])
+
+    def __eq__(self, other):
+        return list(self) == list(other)
+
+    def __repr__(self):
+        return repr(list(self))
+
+class CastlingAbility:
+    __slots__ = ('board',)
+
+    def __init__(self, board):
+        self.board = board
+
+    def __getitem__(self, color):
+        return CastlingSides(self.board, COLOR_INDEX[color])
+
+    def __setitem__(self, color, sides):
+        target = self[color]
+        target[0] = sides[0]
+        target[1] = sides[1]
+        return
+
+    def __iter__(self):
+        return iter(COLORS)
+
+    def __len__(self):
+        return 2
+
+    def keys(self):
+        return list(COLORS)
+
+    def items(self):
+        return [(color, self[color]) for color in COLORS]
+
+    def __eq__(self, other):
+        return all(list(self[color]) == list(other[color]) for color in COLORS)
+
+    def __repr__(self):
+        return repr({color: list(self[color]) for color in COLORS})
 
 class Board:
-    def __init__(self, fen=None):
-        self.fen_to_piece_class = {'P': Pawn, 'N': Knight, 'B': Bishop, 'R': Rook, 'Q': Queen, 'K': King}
-        self.fen_white_to_black = {'P': 'p', 'N': 'n', 'B': 'b', 'R': 'r', 'Q': 'q', 'K': 'k'}
-        self.fen_black_to_white = {b: w for w, b in self.fen_white_to_black.items()}
+    #変換用の表は全てのBoardで共有する
+    fen_to_piece_class = {'P': Pawn, 'N': Knight, 'B': Bishop, 'R': Rook, 'Q': Queen, 'K': King}
+    fen_white_to_black = {'P': 'p', 'N': 'n', 'B': 'b', 'R': 'r', 'Q': 'q', 'K': 'k'}
+    fen_black_to_white = {b: w for w, b in fen_white_to_black.items()}
 
-        self.castling_moves = {WHITE: {'e1g1': 0, 'e1c1': 1}, BLACK: {'e8g8': 0, 'e8c8': 1}}
-        self.turn_dict = {WHITE: BLACK, BLACK: WHITE}
-        
+    castling_moves = {WHITE: {'e1g1': 0, 'e1c1': 1}, BLACK: {'e8g8': 0, 'e8c8': 1}}
+    turn_dict = {WHITE: BLACK, BLACK: WHITE}
+
+    def __init__(self, fen=None, move_cache=None):
+        self.move_cache = move_cache
         self.init_board()
         if fen == None:
             self.set_startpos()
@@ -47,246 +152,442 @@ class Board:
         for i in range(8):
             rank = ''
             for j in range(8):
-                sq = self.squares[i][j]
-                if sq == None:
+                code = self.piece_code_at(i * 8 + j)
+                if code == None:
                     rank += '-'
                 else:
-                    if sq.color == WHITE:
-                        index= 0
-                    else:
-                        index = 1
-                    rank += sq.symbol[index]
+                    rank += PIECE_SYMBOLS[code]
             output += rank
             if i != 7:
                 output += '\n'
         return output
 
+    @property
+    def squares(self):
+        #盤面の実体はbitboard. これは互換性のためのビュー
+        squares = [[None] * 8 for i in range(8)]
+        for code in range(12):
+            for sq in scan(self.pieces_bb[code]):
+                squares[sq // 8][sq % 8] = PIECES[code]
+        return squares
+
+    def piece_at(self, sq):
+        if type(sq) == str:
+            sq = SQUARE_INDEX[sq]
+        code = self.piece_code_at(sq)
+        if code == None:
+            return None
+        return PIECES[code]
+
     def init_board(self):
-        self.squares = []
-        for i in range(8):
-            rank = []
-            for j in range(8):
-                rank.append(None)
-            self.squares.append(rank)
-        self.CastlingAbility = {WHITE: [True, True], BLACK: [True, True]}
+        self.pieces_bb = [0] * 12
+        self.color_bb = [0, 0]
+        self.occupied = 0
+        #マスごとの駒コード, 駒コードごとの枚数, 色ごとの駒の価値の合計
+        self.mailbox = [None] * 64
+        self.piece_counts = [0] * 12
+        self.material = [0, 0]
+        #駒の価値と位置の評価値の合計(白から見た値)
+        self.psq_score = 0
+        self.castling_rights = 15
         self.move_count = [0, 0]
-        self.enpassant_square = None
-        self.turn_of = None
-        self.fen_list = []
+        self.ep_square = None
+        self.turn = None
+        self.fen_ranks = [None] * 8
+        self.undo_stack = []
+        self.zobrist_key = 0
+        self.key_counts = {}
+        self.outcome_cache = None
         return
 
-    def set_startpos(self):
-        self.set_fen('rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1')
+    @property
+    def CastlingAbility(self):
+        return CastlingAbility(self)
+
+    @CastlingAbility.setter
+    def CastlingAbility(self, ability):
+        rights = 0
+        for i in range(4):
+            if ability[COLORS[i // 2]][i % 2]:
+                rights |= 1 << i
+        self.set_castling_rights(rights)
         return
 
-    def set_fen(self, fen):
-        self.init_board()
-        if len(self.fen_list) == 0:
-            self.fen_list = [fen]
-        fen = fen.split(' ')
-
-        pieces = ''.join(fen[0].split('/'))
-        numbers = [str(i) for i in range(10)]
-        index = 0
-        for i in range(len(pieces)):
-            piece = pieces[i]
-            if piece in numbers:
-                index += int(piece)
-                continue
-            if piece in self.fen_black_to_white.keys():
-                piece = self.fen_black_to_white[piece]
-                self.squares[index // 8][index % 8] = self.fen_to_piece_class[piece](BLACK)
-            else:
-                self.squares[index // 8][index % 8] = self.fen_to_piece_class[piece](WHITE)
-            index += 1
+    def set_castling_rights(self, rights):
+        if rights != self.castling_rights:
+            self.castling_rights = rights
+            self.update_key()
+        return
+
+    def set_ep_square(self, ep_square):
+        if ep_square != self.ep_square:
+            self.ep_square = ep_square
+            self.update_key()
+        return
+
+    def set_turn(self, turn):
+        if turn not in COLORS:
+            raise ValueError('invalid turn: ' + str(turn))
+        if turn != self.turn:
+            self.turn = turn
+            self.update_key()
+        return
 
-        if fen[1] == 'w':
-            self.turn_of = WHITE
+    @property
+    def turn_of(self):
+        return self.turn
+
+    @turn_of.setter
+    def turn_of(self, turn):
+        self.set_turn(turn)
+        return
+
+    def update_key(self):
+        #局面を直接書き換えた後に, ハッシュ値と局面の出現回数を合わせる
+        old_key = self.zobrist_key
+        self.zobrist_key = self.compute_zobrist()
+        if self.key_counts.get(old_key, 0) <= 1:
+            self.key_counts.pop(old_key, None)
         else:
-            self.turn_of = BLACK
+            self.key_counts[old_key] -= 1
+        self.key_counts[self.zobrist_key] = self.key_counts.get(self.zobrist_key, 0) + 1
+        self.outcome_cache = None
+        return
+
+    @property
+    def enpassant_square(self):
+        if self.ep_square == None:
+            return None
+        return SQUARE_NAMES[self.ep_square]
 
-        if fen[2] == '-':
-            self.CastlingAbility = {WHITE: [False, False], BLACK: [False, False]}
+    @enpassant_square.setter
+    def enpassant_square(self, uci):
+        if uci == None:
+            self.set_ep_square(None)
         else:
-            self.CastlingAbility = {WHITE: [False, False], BLACK: [False, False]}
-            if 'K' in fen[2]:
-                self.CastlingAbility[WHITE][0] = True
-            if 'Q' in fen[2]:
-                self.CastlingAbility[WHITE][1] = True
-            if 'k' in fen[2]:
-                self.CastlingAbility[BLACK][0] = True
-            if 'q' in fen[2]:
-                self.CastlingAbility[BLACK][1] = True
-
-        if fen[3] == '-':
-            self.enpassant_square = None
+            self.set_ep_square(SQUARE_INDEX[uci])
+        return
+
+    @property
+    def fen_list(self):
+        #局面の履歴はundo_stackを戻しながら必要な時だけ作る
+        board = self.copy()
+        fen_list = [board.return_fen()]
+        while len(board.undo_stack) != 0:
+            board.pop()
+            fen_list.append(board.return_fen())
+        fen_list.reverse()
+        return fen_list
+
+    def copy(self, stack=True):
+        board = Board.__new__(Board)
+        board.__dict__ = self.__dict__.copy()
+        board.pieces_bb = self.pieces_bb[:]
+        board.color_bb = self.color_bb[:]
+        board.mailbox = self.mailbox[:]
+        board.piece_counts = self.piece_counts[:]
+        board.material = self.material[:]
+        board.move_count = self.move_count[:]
+        board.fen_ranks = self.fen_ranks[:]
+        if stack:
+            #undo_stackの要素はタプルなので中身はコピーせずに共有する
+            board.undo_stack = self.undo_stack[:]
+            board.key_counts = self.key_counts.copy()
         else:
-            self.enpassant_square = fen[3]
+            board.undo_stack = []
+            board.key_counts = {self.zobrist_key: 1}
+        return board
+
+    def to_planes(self, out=None, features_out=None):
+        if out is not None:
+            out = out[None]
+        if features_out is not None:
+            features_out = features_out[None]
+        planes, features = boards_to_planes([self], out, features_out)
+        return planes[0], features[0]
+
+    def piece_code_at(self, sq):
+        return self.mailbox[sq]
+
+    def put_piece(self, sq, code):
+        bb = BB_SQUARES[sq]
+        self.pieces_bb[code] |= bb
+        self.color_bb[code // 6] |= bb
+        self.occupied |= bb
+        self.mailbox[sq] = code
+        self.piece_counts[code] += 1
+        self.material[code // 6] += PIECE_VALUES[code % 6]
+        self.psq_score += PSQ_SCORES[code][sq]
+        self.fen_ranks[sq // 8] = None
+        return
+
+    def remove_piece(self, sq):
+        code = self.mailbox[sq]
+        if code != None:
+            bb = BB_SQUARES[sq]
+            self.pieces_bb[code] ^= bb
+            self.color_bb[code // 6] ^= bb
+            self.occupied ^= bb
+            self.mailbox[sq] = None
+            self.piece_counts[code] -= 1
+            self.material[code // 6] -= PIECE_VALUES[code % 6]
+            self.psq_score -= PSQ_SCORES[code][sq]
+            self.fen_ranks[sq // 8] = None
+        return code
 
-        self.move_count = [int(fen[4]), int(fen[5])]
+    def set_startpos(self):
+        self.set_fen('rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1')
         return
 
+    def set_fen(self, fen):
+        self.set_position(*parse_fen(fen))
+        return
+
+    def set_position(self, pieces_bb, turn, castling_rights, ep_square, halfmove, fullmove):
+        self.init_board()
+        self.pieces_bb = list(pieces_bb)
+        self.color_bb = [0, 0]
+        for code in range(12):
+            self.color_bb[code // 6] |= self.pieces_bb[code]
+            for sq in scan(self.pieces_bb[code]):
+                self.mailbox[sq] = code
+                self.psq_score += PSQ_SCORES[code][sq]
+            self.piece_counts[code] = popcount(self.pieces_bb[code])
+            self.material[code // 6] += self.piece_counts[code] * PIECE_VALUES[code % 6]
+        self.occupied = self.color_bb[0] | self.color_bb[1]
+        self.turn = turn
+        self.castling_rights = castling_rights
+        self.ep_square = ep_square
+        self.move_count = [halfmove, fullmove]
+        self.zobrist_key = self.compute_zobrist()
+        self.key_counts = {self.zobrist_key: 1}
+        return
+
+    def to_bytes(self):
+        if popcount(self.occupied) > 32:
+            raise ValueError('too many pieces for binary format')
+        mailbox = self.mailbox
+        packed = bytearray(16)
+        i = 0
+        for sq in scan(self.occupied):
+            packed[i // 2] |= mailbox[sq] << (4 * (i % 2))
+            i += 1
+        ep_square = 255
+        if self.ep_square != None:
+            ep_square = self.ep_square
+        return POSITION_STRUCT.pack(self.occupied, bytes(packed), COLOR_INDEX[self.turn] | (self.castling_rights << 1),
+                                    ep_square, self.move_count[0], self.move_count[1])
+
+    @classmethod
+    def from_bytes(cls, data, move_cache=None):
+        try:
+            occupied, packed, flags, ep_square, halfmove, fullmove = POSITION_STRUCT.unpack(data)
+        except struct.error:
+            raise ValueError('invalid binary position')
+        if popcount(occupied) > 32 or (ep_square > 63 and ep_square != 255):
+            raise ValueError('invalid binary position')
+        pieces_bb = [0] * 12
+        i = 0
+        for sq in scan(occupied):
+            code = (packed[i // 2] >> (4 * (i % 2))) & 15
+            if code >= 12:
+                raise ValueError('invalid binary position')
+            pieces_bb[code] |= BB_SQUARES[sq]
+            i += 1
+        if ep_square == 255:
+            ep_square = None
+        elif not is_valid_ep_square(pieces_bb, COLORS[flags & 1], ep_square):
+            raise ValueError('invalid binary position')
+        board = cls.__new__(cls)
+        board.move_cache = move_cache
+        board.set_position(pieces_bb, COLORS[flags & 1], (flags >> 1) & 15, ep_square, halfmove, fullmove)
+        return board
+
+    def __reduce__(self):
+        #pickleでは32バイトだけを送る (履歴は含まない)
+        return (Board.from_bytes, (self.to_bytes(),))
+
+    def __copy__(self):
+        return self.copy()
+
+    def __deepcopy__(self, memo):
+        return self.copy()
+
+    def ep_key(self):
+        #アンパッサンで取れる時だけハッシュに含める
+        if self.ep_square == None:
+            return 0
+        us = COLOR_INDEX[self.turn]
+        if PAWN_ATTACKS[1 - us][self.ep_square] & self.pieces_bb[us * 6 + PAWN]:
+            return EP_KEYS[self.ep_square % 8]
+        return 0
+
+    def compute_zobrist(self):
+        key = 0
+        for code in range(12):
+            for sq in scan(self.pieces_bb[code]):
+                key ^= PIECE_KEYS[code][sq]
+        if self.turn == BLACK:
+            key ^= TURN_KEY
+        key ^= CASTLING_KEYS[self.castling_rights]
+        key ^= self.ep_key()
+        return key
+
+    def zobrist(self):
+        return self.zobrist_key
+
     def return_fen(self):
-        pieces = ''
-        c = 0
+        #変化した段だけ作り直す
         for i in range(8):
-            for j in range(8):
-                piece = self.squares[i][j]
-                if piece == None:
-                    c += 1
-                else:
-                    if c != 0:
-                        pieces += str(c)
-                    c = 0
-                    if piece.color == WHITE:
-                        pieces += piece.symbol[0]
-                    else:
-                        pieces += piece.symbol[1]
-            if c != 0:
-                pieces += str(c)
-                c = 0
-            if i != 7:
-                pieces += '/'
-        fen = pieces + ' '
+            if self.fen_ranks[i] == None:
+                self.fen_ranks[i] = rank_to_fen(self.pieces_bb, i)
+        fen = '/'.join(self.fen_ranks) + ' '
 
-        fen += {WHITE: 'w ', BLACK: 'b '}[self.turn_of]
+        fen += {WHITE: 'w ', BLACK: 'b '}[self.turn]
 
-        if (True not in self.CastlingAbility[WHITE]) and (True not in self.CastlingAbility[BLACK]):
-            fen += '- '
-        else:
-            if self.CastlingAbility[WHITE][0]:
-                fen += 'K'
-            if self.CastlingAbility[WHITE][1]:
-                fen += 'Q'
-            if self.CastlingAbility[BLACK][0]:
-                fen += 'k'
-            if self.CastlingAbility[BLACK][1]:
-                fen += 'q'
-            fen += ' '
-
-        if self.enpassant_square == None:
+        fen += CASTLING_STRINGS[self.castling_rights] + ' '
+
+        if self.ep_square == None:
             fen += '- '
         else:
-            fen += (self.enpassant_square + ' ')
+            fen += (SQUARE_NAMES[self.ep_square] + ' ')
 
         fen += (str(self.move_count[0]) + ' ' + str(self.move_count[1]))
         return fen
 
     def piece_count(self):
-        output = [[0] * 6, [0] * 6]
-        fen = self.return_fen()
-        pieces = fen.split(' ')[0]
-        symbols = [['P', 'N', 'B', 'R', 'Q', 'K'], ['p', 'n', 'b', 'r', 'q', 'k']]
-        for i in range(len(symbols[0])):
-            output[0][i] = pieces.count(symbols[0][i])
-        for i in range(len(symbols[1])):
-            output[1][i] = pieces.count(symbols[1][i])
-        return output
+        return [self.piece_counts[0:6], self.piece_counts[6:12]]
 
     def change_turn(self):
-        self.turn_of = self.turn_dict[self.turn_of]
+        self.turn = self.turn_dict[self.turn]
         return
 
     def index_to_uci(self, index):
-        uci = ''
-        d = {0: 'a', 1: 'b', 2: 'c', 3: 'd', 4: 'e', 5: 'f', 6: 'g', 7: 'h'}
-        uci += d[index[1]]
-        uci += str(8 - index[0])
-        return uci
+        return SQUARE_NAMES[index[0] * 8 + index[1]]
 
     def uci_to_index(self, uci):
-        d = {'a': 0, 'b': 1, 'c': 2, 'd': 3, 'e': 4, 'f': 5, 'g': 6, 'h': 7}
-        index = [8 - int(uci[1]), d[uci[0]]]
-        return index
+        sq = SQUARE_INDEX[uci]
+        return [sq // 8, sq % 8]
 
     def move_from_uci(self, uci):
-        move = {'from': [0, 0], 'to': [0, 0], '+': None}
-        d = {'a': 0, 'b': 1, 'c': 2, 'd': 3, 'e': 4, 'f': 5, 'g': 6, 'h': 7}
-        move['from'] = self.uci_to_index(uci[0:2])
-        move['to'] = self.uci_to_index(uci[2:4])
+        move = {'from': self.uci_to_index(uci[0:2]), 'to': self.uci_to_index(uci[2:4]), '+': None}
         if len(uci) == 5:
             move['+'] = uci[4]
         return move
 
     def move_to_uci(self, move):
-        uci = ''
-        d = {0: 'a', 1: 'b', 2: 'c', 3: 'd', 4: 'e', 5: 'f', 6: 'g', 7: 'h'}
-        uci += self.index_to_uci(move['from'])
-        uci += self.index_to_uci(move['to'])
+        uci = self.index_to_uci(move['from']) + self.index_to_uci(move['to'])
         if move['+'] != None:
             uci += move['+']
         return uci
 
-    def push_index(self, index_move):
-        piece = self.squares[index_move['from'][0]][index_move['from'][1]]
-        if self.squares[index_move['to'][0]][index_move['to'][1]] != None or type(piece) == Pawn_type:
+    def encode(self, from_sq, to_sq, promotion=None):
+        #盤面を見てキャスリング, アンパッサンのフラグを付ける
+        if promotion != None:
+            return encode_move(from_sq, to_sq, promotion)
+        bb = BB_SQUARES[from_sq]
+        if bb & (self.pieces_bb[KING] | self.pieces_bb[KING + 6]) and (from_sq, to_sq) in CASTLING_ROOK_MOVES:
+            return encode_move(from_sq, to_sq, None, CASTLING)
+        if bb & (self.pieces_bb[PAWN] | self.pieces_bb[PAWN + 6]) and to_sq == self.ep_square and from_sq % 8 != to_sq % 8:
+            return encode_move(from_sq, to_sq, None, EN_PASSANT)
+        return encode_move(from_sq, to_sq)
+
+    def parse_uci(self, uci_move):
+        promotion = None
+        if len(uci_move) == 5:
+            if uci_move[4] not in 'nbrq':
+                raise ValueError('invalid promotion: ' + uci_move)
+            promotion = PROMOTION_SYMBOLS.index(uci_move[4])
+        return self.encode(SQUARE_INDEX[uci_move[0:2]], SQUARE_INDEX[uci_move[2:4]], promotion)
+
+    def push_move(self, move):
+        from_sq = (move >> 6) & 63
+        to_sq = move & 63
+        flag = move & FLAG_MASK
+        key = self.zobrist_key ^ TURN_KEY ^ CASTLING_KEYS[self.castling_rights] ^ self.ep_key()
+        code = self.remove_piece(from_sq)
+        if flag == EN_PASSANT:
+            captured = self.remove_piece((from_sq // 8) * 8 + to_sq % 8)
+            key ^= PIECE_KEYS[captured][(from_sq // 8) * 8 + to_sq % 8]
+        else:
+            captured = self.remove_piece(to_sq)
+            if captured != None:
+                key ^= PIECE_KEYS[captured][to_sq]
+        self.undo_stack.append((move, code, captured, self.castling_rights, self.ep_square,
+                                self.move_count[0], self.zobrist_key))
+        self.outcome_cache = None
+        key ^= PIECE_KEYS[code][from_sq]
+
+        piece_type = code % 6
+        if captured != None or piece_type == PAWN:
             self.move_count[0] = 0
         else:
             self.move_count[0] += 1
-        self.squares[index_move['to'][0]][index_move['to'][1]] = piece
-        self.squares[index_move['from'][0]][index_move['from'][1]] = None
-        self.enpassant_square = None
-        if type(piece) == King_type:
-            if self.turn_of == WHITE:
-                self.CastlingAbility[WHITE] = [False, False]
-            else:
-                self.CastlingAbility[BLACK] = [False, False]
-            uci_move = self.move_to_uci(index_move)
-            if uci_move in self.castling_moves[self.turn_of].keys():
-                if uci_move == 'e1g1':
-                    piece = self.squares[7][7]
-                    self.squares[7][7] = None
-                    self.squares[7][5] = piece
-                elif uci_move == 'e1c1':
-                    piece = self.squares[7][0]
-                    self.squares[7][0] = None
-                    self.squares[7][3] = piece
-                elif uci_move == 'e8g8':
-                    piece = self.squares[0][7]
-                    self.squares[0][7] = None
-                    self.squares[0][5] = piece
-                elif uci_move == 'e8c8':
-                    piece = self.squares[0][0]
-                    self.squares[0][0] = None
-                    self.squares[0][3] = piece
-        elif type(piece) == Rook_type:
-            if index_move['from'][0] == 7 and index_move['from'][1] == 0:
-                self.CastlingAbility[WHITE][1] = False
-            if index_move['from'][0] == 7 and index_move['from'][1] == 7:
-                self.CastlingAbility[WHITE][0] = False
-            if index_move['from'][0] == 0 and index_move['from'][1] == 0:
-                self.CastlingAbility[BLACK][1] = False
-            if index_move['from'][0] == 0 and index_move['from'][1] == 7:
-                self.CastlingAbility[BLACK][0] = False
-        elif type(piece) == Pawn_type and abs(index_move['to'][0] - index_move['from'][0]) == 2:
-            self.enpassant_square = self.index_to_uci(self.return_route(index_move)[0])
-        elif type(piece) == Pawn_type and index_move['+'] != None:
-            d = {'n': Knight, 'b': Bishop, 'r': Rook, 'q': Queen}
-            self.squares[index_move['to'][0]][index_move['to'][1]] = d[index_move['+']](self.turn_of)
-
-        if index_move['to'][0] == 0 and index_move['to'][1] == 0:
-            self.CastlingAbility[BLACK][1] = False
-        if index_move['to'][0] == 0 and index_move['to'][1] == 7:
-            self.CastlingAbility[BLACK][0] = False
-        if index_move['to'][0] == 7 and index_move['to'][1] == 0:
-            self.CastlingAbility[WHITE][1] = False
-        if index_move['to'][0] == 7 and index_move['to'][1] == 7:
-            self.CastlingAbility[WHITE][0] = False
-        
-        if self.turn_of == BLACK:
+        if flag == PROMOTION:
+            code = code - PAWN + ((move >> 12) & 3) + KNIGHT
+        self.put_piece(to_sq, code)
+        key ^= PIECE_KEYS[code][to_sq]
+        self.ep_square = None
+        if piece_type == KING:
+            self.castling_rights &= ~(3 << (2 * (code // 6)))
+            if flag == CASTLING:
+                rook_from, rook_to = CASTLING_ROOK_MOVES[(from_sq, to_sq)]
+                rook = self.remove_piece(rook_from)
+                self.put_piece(rook_to, rook)
+                key ^= PIECE_KEYS[rook][rook_from] ^ PIECE_KEYS[rook][rook_to]
+        elif piece_type == PAWN and abs(to_sq - from_sq) == 16:
+            self.ep_square = (from_sq + to_sq) // 2
+        self.castling_rights &= CASTLING_MASKS[from_sq] & CASTLING_MASKS[to_sq]
+
+        if self.turn == BLACK:
             self.move_count[1] += 1
         self.change_turn()
-        self.fen_list.append(self.return_fen())
+        self.zobrist_key = key ^ CASTLING_KEYS[self.castling_rights] ^ self.ep_key()
+        self.key_counts[self.zobrist_key] = self.key_counts.get(self.zobrist_key, 0) + 1
+        return
+
+    def make_move(self, from_sq, to_sq, promotion=None):
+        self.push_move(self.encode(from_sq, to_sq, promotion))
+        return
+
+    def push_index(self, index_move):
+        promotion = None
+        if index_move['+'] != None:
+            promotion = PROMOTION_SYMBOLS.index(index_move['+'])
+        self.make_move(index_move['from'][0] * 8 + index_move['from'][1],
+                       index_move['to'][0] * 8 + index_move['to'][1], promotion)
         return
 
     def push(self, uci_move):
-        index_move = self.move_from_uci(uci_move)
-        self.push_index(index_move)
+        self.push_move(self.parse_uci(uci_move))
         return
 
     def pop(self):
-        self.fen_list.pop(-1)
-        self.set_fen(self.fen_list[-1])
+        move, code, captured, castling_rights, ep_square, halfmove, zobrist_key = self.undo_stack.pop()
+        if self.key_counts[self.zobrist_key] == 1:
+            del self.key_counts[self.zobrist_key]
+        else:
+            self.key_counts[self.zobrist_key] -= 1
+        from_sq = (move >> 6) & 63
+        to_sq = move & 63
+        flag = move & FLAG_MASK
+        self.change_turn()
+        if self.turn == BLACK:
+            self.move_count[1] -= 1
+        self.remove_piece(to_sq)
+        self.put_piece(from_sq, code)
+        if flag == EN_PASSANT:
+            self.put_piece((from_sq // 8) * 8 + to_sq % 8, captured)
+        elif captured != None:
+            self.put_piece(to_sq, captured)
+        if flag == CASTLING:
+            rook_from, rook_to = CASTLING_ROOK_MOVES[(from_sq, to_sq)]
+            self.put_piece(rook_from, self.remove_piece(rook_to))
+        self.castling_rights = castling_rights
+        self.ep_square = ep_square
+        self.move_count[0] = halfmove
+        self.zobrist_key = zobrist_key
+        self.outcome_cache = None
         return
 
     def return_route(self, move):
@@ -327,225 +628,375 @@ class Board:
         return output
 
     def is_legal_pseudo(self, move):
-        #
-        move_piece = self.squares[move['from'][0]][move['from'][1]]
-        if move_piece == None:
-            return False
-        if move_piece.color != self.turn_of:
-            return False
-        #
-        if min(move['to']) < 0 or max(move['to']) > 7:
-            return False
-        #
-        sq = self.squares[move['to'][0]][move['to'][1]]
-        if sq != None and sq.color == self.turn_of:
+        if min(move['from'] + move['to']) < 0 or max(move['from'] + move['to']) > 7:
             return False
-        #
-        if move['+'] != None:
-            if type(move_piece) != Pawn_type:
-                return False
-            if move_piece.color == WHITE and move['to'][0] != 0:
-                return False
-            if move_piece.color == BLACK and move['to'][0] != 7:
-                return False
-        #
-        if type(move_piece) == Pawn_type:
-            if self.turn_of == WHITE and move['to'][0] == 0 and move['+'] == None:
-                return False
-            if self.turn_of == BLACK and move['to'][0] == 7 and move['+'] == None:
-                return False
-            
-            if move['from'][1] == move['to'][1]:
-                if self.squares[move['to'][0]][move['to'][1]] != None:
-                    return False
-                if self.turn_of == WHITE:
-                    start_rank = 6
-                else:
-                    start_rank = 1
-                if move['from'][0] != start_rank and abs(move['from'][0] - move['to'][0]) != 1:
-                    return False
-                if self.turn_of == WHITE:
-                    if move['from'][0] <= move['to'][0]:
-                        return False
-                else:
-                    if move['from'][0] >= move['to'][0]:
-                        return False
-                if abs(move['from'][0] - move['to'][0]) == 2:
-                    route_squares = self.return_route(move)
-                    for route in route_squares:
-                        if self.squares[route[0]][route[1]] != None:
-                            return False
-            else:
-                for i in range(len(move_piece.attack_squares) + 1):
-                    if i == len(move_piece.attack_squares):
-                        return False
-                    index = [move['from'][0] + move_piece.attack_squares[i][0],
-                                 move['from'][1] + move_piece.attack_squares[i][1]]
-                    if move['to'][0] == index[0] and move['to'][1] == index[1]:
-                        break
-                sq = self.squares[index[0]][index[1]]
-                if self.index_to_uci(index) == self.enpassant_square:
-                    pass
-                elif sq == None or sq.color == self.turn_of:
-                    return False
-        else:
-            for i in range(len(move_piece.attack_squares) + 1):
-                if i == len(move_piece.attack_squares):
-                    return False
-                index = [move['from'][0] + move_piece.attack_squares[i][0],
-                             move['from'][1] + move_piece.attack_squares[i][1]]
-                if move['to'][0] == index[0] and move['to'][1] == index[1]:
-                    break
-            if type(move_piece) == Knight_type:
-                pass
-            else:
-                route = self.return_route(move)
-                for i in route:
-                    sq = self.squares[i[0]][i[1]]
-                    if sq != None:
-                        return False
-        return True
+        return self.parse_uci(self.move_to_uci(move)) in self.pseudo_legal_moves(BB_SQUARES[move['from'][0] * 8 + move['from'][1]])
 
     def is_attackable(self, move):
         from_sq = move['from']
         to_sq = move['to']
         if max(to_sq) > 7 or min(to_sq) < 0:
             return False
-        if type(self.squares[from_sq[0]][from_sq[1]]) == Knight_type:
+        if self.pieces_bb[KNIGHT] & BB_SQUARES[from_sq[0] * 8 + from_sq[1]]:
             return True
-        else:
-            route_squares = self.return_route(move)
-            for sq in route_squares:
-                if self.squares[sq[0]][sq[1]] != None:#障害物あり
-                    return False
+        if self.pieces_bb[KNIGHT + 6] & BB_SQUARES[from_sq[0] * 8 + from_sq[1]]:
+            return True
+        route_squares = self.return_route(move)
+        for sq in route_squares:
+            if self.occupied & BB_SQUARES[sq[0] * 8 + sq[1]]:#障害物あり
+                return False
         return True
 
+    def attack_mask(self, turn):
+        start = COLOR_INDEX[turn] * 6
+        bb = 0
+        for sq in scan(self.pieces_bb[start + PAWN]):
+            bb |= PAWN_ATTACKS[COLOR_INDEX[turn]][sq]
+        for sq in scan(self.pieces_bb[start + KNIGHT]):
+            bb |= KNIGHT_ATTACKS[sq]
+        for sq in scan(self.pieces_bb[start + BISHOP] | self.pieces_bb[start + QUEEN]):
+            bb |= bishop_attacks(sq, self.occupied)
+        for sq in scan(self.pieces_bb[start + ROOK] | self.pieces_bb[start + QUEEN]):
+            bb |= rook_attacks(sq, self.occupied)
+        for sq in scan(self.pieces_bb[start + KING]):
+            bb |= KING_ATTACKS[sq]
+        return bb
+
     def return_attack_squares(self, turn):
-        backup_turn_of = self.turn_of
-        self.turn_of = turn
-        moves = []
-        for i in range(8):
-            for j in range(8):
-                sq = self.squares[i][j]
-                if sq != None and sq.color == self.turn_of:
-                    for k in range(len(sq.attack_squares)):
-                        index =  [i + sq.attack_squares[k][0],
-                                       j + sq.attack_squares[k][1]]
-                        move = {'from': [i, j], 'to': index, '+': None}
-                        if index not in moves and self.is_attackable(move):
-                            moves.append(move)
-        attack_squares = []
-        for move in moves:
-            if move['to'] not in attack_squares:
-                attack_squares.append(move['to'])
-        self.turn_of = backup_turn_of
-        return attack_squares
+        return [[sq // 8, sq % 8] for sq in scan(self.attack_mask(turn))]
 
     def is_legal_castling(self, move, index):
-        if not self.CastlingAbility[self.turn_of][index]:
+        return self.can_castle(2 * COLOR_INDEX[self.turn] + index)
+
+    def can_castle(self, index):
+        if not self.castling_rights & (1 << index):
             return False
-        if self.is_check():
+        color = index // 2
+        king_from, king_to, empty, safe = CASTLING_PATHS[index]
+        if not self.pieces_bb[color * 6 + KING] & BB_SQUARES[king_from]:
             return False
-        route_move_dict = {'e8g8': 'e8h8', 'e8c8': 'e8a8', 'e1g1': 'e1h1', 'e1c1': 'e1a1'}
-        route_move_dict2 = {'e8g8': 'e8h8', 'e8c8': 'e8b8', 'e1g1': 'e1h1', 'e1c1': 'e1b1'}
-        
-        move1 = route_move_dict[self.move_to_uci(move)]
-        move1 = self.move_from_uci(move1)
-        
-        move2 = route_move_dict2[self.move_to_uci(move)]
-        move2 = self.move_from_uci(move2)
-        
-        route = self.return_route(move1)
-        route2 = self.return_route(move2)
-        
-        attacked_squares = self.return_attack_squares(self.turn_dict[self.turn_of])
-        for i in range(len(route)):
-            sq = self.squares[route[i][0]][route[i][1]]
-            if sq != None:
+        if not self.pieces_bb[color * 6 + ROOK] & BB_SQUARES[CASTLING_ROOK_MOVES[(king_from, king_to)][0]]:
+            return False
+        if self.occupied & empty:
+            return False
+        for sq in scan(safe):
+            if self.is_attacked(sq, 1 - color, self.occupied, BB_ALL):
                 return False
-        for i in range(len(route2)):
-            for j in range(len(attacked_squares)):
-                if route2[i][0] == attacked_squares[j][0] and route2[i][1] == attacked_squares[j][1]:
-                    return False
         return True
 
     def is_legal(self, uci_move):
-        move = self.move_from_uci(uci_move)
-        if type(self.squares[move['from'][0]][move['from'][1]]) == King_type:
-            if uci_move in self.castling_moves[self.turn_of].keys():
-                sq = self.squares[move['from'][0]][move['from'][1]]
-                if type(sq) != King_type or sq.color != self.turn_of:
-                    return False
-                return self.is_legal_castling(move, self.castling_moves[self.turn_of][uci_move])
-        if not self.is_legal_pseudo(move):
-            return False
-        if self.is_suiside_move(move):
+        try:
+            move = self.parse_uci(uci_move)
+        except ValueError:
             return False
-        return True
+        return move in self.generate_legal_moves(BB_SQUARES[(move >> 6) & 63])
 
     def is_check(self):
-        attack_squares = self.return_attack_squares(self.turn_dict[self.turn_of])
-        for i in attack_squares:
-            sq = self.squares[i[0]][i[1]]
-            if type(sq) == King_type and sq.color == self.turn_of:
-                return True
+        us = COLOR_INDEX[self.turn]
+        return self.is_attacked(lsb(self.pieces_bb[us * 6 + KING]), 1 - us, self.occupied, BB_ALL)
+
+    def attackers(self, sq, by_color=None):
+        if type(sq) == str:
+            sq = SQUARE_INDEX[sq]
+        bb = 0
+        for color in (0, 1):
+            if by_color != None and COLOR_INDEX[by_color] != color:
+                continue
+            start = color * 6
+            queens = self.pieces_bb[start + QUEEN]
+            bb |= KNIGHT_ATTACKS[sq] & self.pieces_bb[start + KNIGHT]
+            bb |= PAWN_ATTACKS[1 - color][sq] & self.pieces_bb[start + PAWN]
+            bb |= KING_ATTACKS[sq] & self.pieces_bb[start + KING]
+            bb |= bishop_attacks(sq, self.occupied) & (self.pieces_bb[start + BISHOP] | queens)
+            bb |= rook_attacks(sq, self.occupied) & (self.pieces_bb[start + ROOK] | queens)
+        return bb
+
+    def is_square_attacked(self, sq, by_color):
+        if type(sq) == str:
+            sq = SQUARE_INDEX[sq]
+        return self.is_attacked(sq, COLOR_INDEX[by_color], self.occupied, BB_ALL)
+
+    def is_attacked(self, sq, color, occupied, mask):
+        #occupied, maskを変えて指した後の局面でも使えるようにしている
+        start = color * 6
+        if KNIGHT_ATTACKS[sq] & self.pieces_bb[start + KNIGHT] & mask:
+            return True
+        if PAWN_ATTACKS[1 - color][sq] & self.pieces_bb[start + PAWN] & mask:
+            return True
+        if KING_ATTACKS[sq] & self.pieces_bb[start + KING] & mask:
+            return True
+        queens = self.pieces_bb[start + QUEEN]
+        if bishop_attacks(sq, occupied) & (self.pieces_bb[start + BISHOP] | queens) & mask:
+            return True
+        if rook_attacks(sq, occupied) & (self.pieces_bb[start + ROOK] | queens) & mask:
+            return True
         return False
 
+    def is_safe_move(self, from_sq, to_sq):
+        us = COLOR_INDEX[self.turn]
+        from_bb = BB_SQUARES[from_sq]
+        to_bb = BB_SQUARES[to_sq]
+        occupied = (self.occupied ^ from_bb) | to_bb
+        enemy = self.color_bb[1 - us] & ~to_bb
+        if self.pieces_bb[us * 6 + KING] & from_bb:
+            king_sq = to_sq
+        else:
+            king_sq = lsb(self.pieces_bb[us * 6 + KING])
+            if to_sq == self.ep_square and self.pieces_bb[us * 6 + PAWN] & from_bb:
+                captured_bb = BB_SQUARES[(from_sq // 8) * 8 + to_sq % 8]
+                occupied ^= captured_bb
+                enemy ^= captured_bb
+        return not self.is_attacked(king_sq, 1 - us, occupied, enemy)
+
     def is_suiside_move(self, move):
-        self.push_index(move)
-        self.change_turn()
-        if self.is_check():
-            self.pop()
+        return not self.is_safe_move(move['from'][0] * 8 + move['from'][1], move['to'][0] * 8 + move['to'][1])
+
+    def pseudo_legal_moves(self, from_mask=BB_ALL, captures=True, quiets=True, castling=True):
+        #captures: 駒を取る手と成る手, quiets: それ以外の手, castling: キャスリング
+        us = COLOR_INDEX[self.turn]
+        start = us * 6
+        enemy = self.color_bb[1 - us]
+        occupied = self.occupied
+        not_own = 0
+        if captures:
+            not_own |= enemy
+        if quiets:
+            not_own |= ~occupied & BB_ALL
+        moves = []
+
+        if us == 0:
+            step, double_rank, last_rank = -8, 6, 0
+        else:
+            step, double_rank, last_rank = 8, 1, 7
+        ep_bb = 0
+        if self.ep_square != None:
+            ep_bb = BB_SQUARES[self.ep_square]
+        for from_sq in scan(self.pieces_bb[start + PAWN] & from_mask):
+            base = from_sq << 6
+            targets = 0
+            if captures:
+                targets = PAWN_ATTACKS[us][from_sq] & enemy
+                if PAWN_ATTACKS[us][from_sq] & ep_bb:
+                    moves.append(EN_PASSANT | base | self.ep_square)
+            to_sq = from_sq + step
+            if 0 <= to_sq <= 63 and not occupied & BB_SQUARES[to_sq]:
+                pushes = BB_SQUARES[to_sq]
+                if from_sq // 8 == double_rank and not occupied & BB_SQUARES[to_sq + step]:
+                    pushes |= BB_SQUARES[to_sq + step]
+                #成る手は駒を取らなくてもcapturesの方に入れる
+                if not captures:
+                    pushes &= ~BB_RANKS[last_rank]
+                if not quiets:
+                    pushes &= BB_RANKS[last_rank]
+                targets |= pushes
+            for to_sq in scan(targets):
+                if to_sq // 8 == last_rank:
+                    for promotion in (QUEEN, ROOK, BISHOP, KNIGHT):
+                        moves.append(PROMOTION | ((promotion - KNIGHT) << 12) | base | to_sq)
+                else:
+                    moves.append(base | to_sq)
+
+        for from_sq in scan(self.pieces_bb[start + KNIGHT] & from_mask):
+            base = from_sq << 6
+            for to_sq in scan(KNIGHT_ATTACKS[from_sq] & not_own):
+                moves.append(base | to_sq)
+        for from_sq in scan((self.pieces_bb[start + BISHOP] | self.pieces_bb[start + QUEEN]) & from_mask):
+            base = from_sq << 6
+            for to_sq in scan(bishop_attacks(from_sq, occupied) & not_own):
+                moves.append(base | to_sq)
+        for from_sq in scan((self.pieces_bb[start + ROOK] | self.pieces_bb[start + QUEEN]) & from_mask):
+            base = from_sq << 6
+            for to_sq in scan(rook_attacks(from_sq, occupied) & not_own):
+                moves.append(base | to_sq)
+        for from_sq in scan(self.pieces_bb[start + KING] & from_mask):
+            base = from_sq << 6
+            for to_sq in scan(KING_ATTACKS[from_sq] & not_own):
+                moves.append(base | to_sq)
+
+        if castling:
+            for index in (2 * us, 2 * us + 1):
+                king_from, king_to = CASTLING_PATHS[index][0], CASTLING_PATHS[index][1]
+                if BB_SQUARES[king_from] & from_mask and self.can_castle(index):
+                    moves.append(CASTLING | (king_from << 6) | king_to)
+        return moves
+
+    def checkers_and_pins(self):
+        us = COLOR_INDEX[self.turn]
+        start = (1 - us) * 6
+        own = self.color_bb[us]
+        king_sq = lsb(self.pieces_bb[us * 6 + KING])
+        checkers = KNIGHT_ATTACKS[king_sq] & self.pieces_bb[start + KNIGHT]
+        checkers |= PAWN_ATTACKS[us][king_sq] & self.pieces_bb[start + PAWN]
+        check_mask = checkers
+        pins = {}
+        queens = self.pieces_bb[start + QUEEN]
+        rooks = self.pieces_bb[start + ROOK] | queens
+        bishops = self.pieces_bb[start + BISHOP] | queens
+        for d in range(8):
+            if d < 4:
+                sliders = rooks
+            else:
+                sliders = bishops
+            ray = RAYS[d][king_sq]
+            if not ray & sliders:
+                continue
+            #キングから見て最初の駒が敵の飛び駒なら王手, 自駒を1枚だけ挟んでいればピン
+            blockers = ray & self.occupied
+            first = first_square(d, blockers)
+            if sliders & BB_SQUARES[first]:
+                checkers |= BB_SQUARES[first]
+                check_mask |= ray ^ RAYS[d][first]
+            elif own & BB_SQUARES[first]:
+                blockers ^= BB_SQUARES[first]
+                if blockers:
+                    second = first_square(d, blockers)
+                    if sliders & BB_SQUARES[second]:
+                        pins[first] = ray ^ RAYS[d][second]
+        return king_sq, checkers, check_mask, pins
+
+    def generate_legal_moves(self, from_mask=BB_ALL):
+        if self.move_cache != None and from_mask == BB_ALL:
+            moves = self.move_cache.get(self.zobrist_key)
+            if moves == None:
+                moves = array('H', self.compute_legal_moves(from_mask))
+                self.move_cache.put(self.zobrist_key, moves)
+            return moves.tolist()
+        return self.compute_legal_moves(from_mask)
+
+    def compute_legal_moves(self, from_mask):
+        king_sq, checkers, check_mask, pins = self.checkers_and_pins()
+        if checkers == 0:
+            check_mask = BB_ALL
+        elif popcount(checkers) >= 2:
+            #両王手はキングが動くしかない
+            from_mask &= BB_SQUARES[king_sq]
+        return self.filter_legal(self.pseudo_legal_moves(from_mask), king_sq, check_mask, pins)
+
+    def filter_legal(self, pseudo_moves, king_sq, check_mask, pins):
+        moves = []
+        for move in pseudo_moves:
+            from_sq = (move >> 6) & 63
+            to_sq = move & 63
+            if from_sq == king_sq:
+                #キャスリングはcan_castleで確認済み
+                if move & FLAG_MASK == CASTLING or self.is_safe_move(from_sq, to_sq):
+                    moves.append(move)
+            elif move & FLAG_MASK == EN_PASSANT:
+                #アンパッサンは横方向の開き王手があるので指した後の局面で確認する
+                if self.is_safe_move(from_sq, to_sq):
+                    moves.append(move)
+            elif check_mask & BB_SQUARES[to_sq]:
+                if from_sq not in pins or pins[from_sq] & BB_SQUARES[to_sq]:
+                    moves.append(move)
+        return moves
+
+    def generate_staged_moves(self, captures=True, quiets=True, castling=True):
+        #駒を取る手と成る手, それ以外の手, キャスリングの順に, 必要になった所で生成して返す
+        #途中で局面を変える場合は, 次の手を受け取る前に元に戻しておくこと
+        king_sq, checkers, check_mask, pins = self.checkers_and_pins()
+        from_mask = BB_ALL
+        if checkers == 0:
+            check_mask = BB_ALL
+        elif popcount(checkers) >= 2:
+            from_mask = BB_SQUARES[king_sq]
+        if captures:
+            for move in self.pseudo_legal_moves(from_mask, True, False, False):
+                if self.filter_legal((move,), king_sq, check_mask, pins):
+                    yield move
+        if quiets:
+            for move in self.pseudo_legal_moves(from_mask, False, True, False):
+                if self.filter_legal((move,), king_sq, check_mask, pins):
+                    yield move
+        if castling and checkers == 0:
+            yield from self.pseudo_legal_moves(from_mask, False, False, True)
+        return
+
+    def has_legal_moves(self):
+        for _ in self.generate_staged_moves():
             return True
-        self.pop()
         return False
 
     def legal_moves(self):
-        candidate_moves = []
-        for i in range(8):
-            for j in range(8):
-                sq = self.squares[i][j]
-                if sq != None and sq.color == self.turn_of:
-                    for k in range(len(sq.attack_squares)):
-                        index = [i + sq.attack_squares[k][0],
-                                     j + sq.attack_squares[k][1]]
-                        if max(index) > 7 or min(index) < 0:
-                            continue
-                        candidate_moves.append({'from': [i, j], 'to': index, '+': None})
-                        if index[0] in [0, 7]:
-                            candidate_moves.append({'from': [i, j], 'to': index, '+': 'n'})
-                            candidate_moves.append({'from': [i, j], 'to': index, '+': 'b'})
-                            candidate_moves.append({'from': [i, j], 'to': index, '+': 'r'})
-                            candidate_moves.append({'from': [i, j], 'to': index, '+': 'q'})
-                    if type(sq) == Pawn_type:
-                        move_squares = ((-2, 0), (-1, 0), (1, 0), (2, 0))
-                        for k in range(4):
-                            index = [i + move_squares[k][0],
-                                          j + move_squares[k][1]]
-                            if max(index) > 7 or min(index) < 0:
-                                continue
-                            candidate_moves.append({'from': [i, j], 'to': index, '+': None})
-                            if index[0] in [0, 7]:
-                                candidate_moves.append({'from': [i, j], 'to': index, '+': 'n'})
-                                candidate_moves.append({'from': [i, j], 'to': index, '+': 'b'})
-                                candidate_moves.append({'from': [i, j], 'to': index, '+': 'r'})
-                                candidate_moves.append({'from': [i, j], 'to': index, '+': 'q'})
-        candidate_moves.extend([self.move_from_uci(move) for move in self.castling_moves[WHITE].keys()])
-        candidate_moves.extend([self.move_from_uci(move) for move in self.castling_moves[BLACK].keys()])
-        legal_moves = []
-        for move in candidate_moves:
-            move = self.move_to_uci(move)
-            if move not in legal_moves and self.is_legal(move):
-                legal_moves.append(move)
-        return legal_moves
+        return [int_to_uci(move) for move in self.generate_legal_moves()]
 
-    def is_stalemate(self):
-        if self.is_check():
+    def legal_moves_int(self):
+        return array('H', self.generate_legal_moves())
+
+    def perft(self, depth, table=None):
+        if depth == 0:
+            return 1
+        if table != None:
+            nodes = table.get(self.zobrist_key, depth)
+            if nodes != None:
+                return nodes
+        moves = self.generate_legal_moves()
+        if depth == 1:
+            nodes = len(moves)
+        else:
+            nodes = 0
+            for move in moves:
+                self.push_move(move)
+                nodes += self.perft(depth - 1, table)
+                self.pop()
+        if table != None:
+            table.put(self.zobrist_key, depth, nodes)
+        return nodes
+
+    def perft_divide(self, depth, table=None):
+        result = {}
+        for move in self.generate_legal_moves():
+            self.push_move(move)
+            result[int_to_uci(move)] = self.perft(depth - 1, table)
+            self.pop()
+        return result
+
+    def perft_parallel(self, depth, workers=None, split_depth=1, table_size=0):
+        #split_depth手先の局面をプロセスに分けて数える. (合計, 初手ごとの数)を返す
+        from .parallel import perft_parallel
+        return perft_parallel(self, depth, workers, split_depth, table_size)
+
+    def repetition_count(self):
+        #同じ手番の局面だけを, 最後の不可逆な手まで遡って数える
+        count = 1
+        for i in range(2, min(self.move_count[0], len(self.undo_stack)) + 1, 2):
+            if self.undo_stack[-i][6] == self.zobrist_key:
+                count += 1
+        return count
+
+    def is_repetition(self, n=3):
+        #ほとんどの局面は履歴全体でもn回未満なので, 遡るのはその時だけ
+        if self.key_counts.get(self.zobrist_key, 0) < n:
             return False
-        return len(self.legal_moves()) == 0
+        return self.repetition_count() >= n
+
+    def is_threefold_repetition(self):
+        return self.is_repetition(3)
+
+    def is_fivefold_repetition(self):
+        return self.is_repetition(5)
+
+    def outcome(self):
+        #push/popされるまで結果を使い回す
+        if self.outcome_cache == None:
+            check = self.checkers_and_pins()[1] != 0
+            if self.move_cache != None:
+                #キャッシュがあれば後でlegal_moves()を呼ばれても生成は1回で済む
+                no_moves = len(self.generate_legal_moves()) == 0
+            else:
+                no_moves = not self.has_legal_moves()
+            winner = None
+            if check and no_moves:
+                winner = self.turn_dict[self.turn]
+            self.outcome_cache = Outcome(check, check and no_moves, (not check) and no_moves,
+                                         self.move_count[0] >= 100, self.is_insufficient_material(),
+                                         self.is_repetition(3), self.is_repetition(5), winner)
+        return self.outcome_cache
+
+    def is_stalemate(self):
+        return self.outcome().stalemate
 
     def is_checkmate(self):
-        return self.is_check() and len(self.legal_moves()) == 0
+        return self.outcome().checkmate
 
     def is_insufficient_material(self):
         pieces = self.piece_count()
@@ -566,6 +1017,10 @@ class Board:
         return True
 
     def is_draw(self):
-        return self.is_insufficient_material() or self.is_stalemate() or self.move_count[0] >= 100
-
+        outcome = self.outcome()
+        if outcome.checkmate:
+            return False
+        return outcome.stalemate or outcome.fifty_moves or outcome.insufficient_material or outcome.repetition
 
+#Board.stats.enable() または with Board.stats: で計測する
+Board.stats = Stats(Board)
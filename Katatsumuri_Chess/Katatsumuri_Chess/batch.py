@@ -0,0 +1,77 @@
+"""
+This file is part of Katatsumuri_Chess
+
+Copyright (c) 2022 YuaHyodo
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+from collections import deque, namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+import os
+
+from . import Board, LRUCache
+
+PositionInfo = namedtuple('PositionInfo', ['fen', 'legal_moves', 'is_check', 'is_checkmate',
+                                           'is_stalemate', 'is_draw', 'piece_count'])
+
+def evaluate_fen(fen):
+    board = Board(fen, move_cache=LRUCache(1))
+    #move_cacheがあるのでoutcome()とlegal_moves()で合法手の生成は1回だけになる
+    outcome = board.outcome()
+    return PositionInfo(fen, board.legal_moves(), outcome.check, outcome.checkmate,
+                        outcome.stalemate, board.is_draw(), board.piece_count())
+
+def evaluate_chunk(fens):
+    #読めないFENが1つあっても全体を止めず, その位置にはfen以外がNoneの結果を入れる
+    results = []
+    for fen in fens:
+        try:
+            results.append(evaluate_fen(fen))
+        except ValueError:
+            results.append(PositionInfo(fen, None, None, None, None, None, None))
+    return results
+
+def chunked(iterable, size):
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if len(chunk) == 0:
+            return
+        yield chunk
+
+def evaluate_fens(fens, workers=None, chunksize=256, prefetch=2):
+    #入力と同じ順番で結果を返す. 先読みするチャンク数を制限して, 入力全体をメモリに載せないようにする
+    if workers == None:
+        workers = os.cpu_count() or 1
+    chunks = chunked(fens, chunksize)
+    if workers <= 1:
+        for chunk in chunks:
+            yield from evaluate_chunk(chunk)
+        return
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = deque()
+        for chunk in islice(chunks, workers * prefetch):
+            pending.append(executor.submit(evaluate_chunk, chunk))
+        while len(pending) != 0:
+            results = pending.popleft().result()
+            for chunk in islice(chunks, 1):
+                pending.append(executor.submit(evaluate_chunk, chunk))
+            yield from results
@@ -0,0 +1,147 @@
+"""
+This file is part of Katatsumuri_Chess
+
+Copyright (c) 2022 YuaHyodo
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+import argparse
+import json
+import sys
+import time
+
+from .. import Board, parse_fen_uncached
+
+#(名前, FEN, 深さ1からのperftの正解)
+POSITIONS = (
+    ('startpos', 'rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1',
+     (20, 400, 8902, 197281, 4865609, 119060324)),
+    ('kiwipete', 'r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1',
+     (48, 2039, 97862, 4085603, 193690690)),
+    ('endgame_ep', '8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 1',
+     (14, 191, 2812, 43238, 674624, 11030083)),
+    ('promotion_castling', 'r3k2r/Pppp1ppp/1b3nbN/nP6/BBP1P3/q4N2/Pp1P2PP/R2Q1RK1 w kq - 0 1',
+     (6, 264, 9467, 422333, 15833292)),
+    ('promotion_check', 'rnbq1k1r/pp1Pbppp/2p5/8/2B5/8/PPP1NnPP/RNBQK2R w KQ - 1 8',
+     (44, 1486, 62379, 2103487, 89941194)),
+    ('middlegame', 'r4rk1/1pp1qppp/p1np1n2/2b1p1B1/2B1P1b1/P1NP1N2/1PP1QPPP/R4RK1 w - - 0 10',
+     (46, 2079, 89890, 3894594, 164075551)),
+)
+
+def run_perft(depth, positions=POSITIONS):
+    results = []
+    for name, fen, counts in positions:
+        board = Board(fen)
+        start = time.perf_counter()
+        nodes = board.perft(depth)
+        seconds = time.perf_counter() - start
+        expected = None
+        if depth <= len(counts):
+            expected = counts[depth - 1]
+        results.append({'name': name, 'depth': depth, 'nodes': nodes, 'expected': expected,
+                        'ok': expected == None or nodes == expected, 'seconds': seconds,
+                        'nps': nodes / seconds if seconds > 0 else 0.0})
+    return results
+
+def bench_legal_moves(boards, iterations):
+    count = 0
+    for board in boards:
+        for _ in range(iterations):
+            board.legal_moves()
+            count += 1
+    return count
+
+def bench_push_pop(boards, iterations):
+    count = 0
+    for board in boards:
+        moves = board.legal_moves()
+        for _ in range(iterations):
+            for move in moves:
+                board.push(move)
+                board.pop()
+            count += len(moves)
+    return count
+
+def bench_fen(boards, iterations):
+    count = 0
+    for board in boards:
+        fen = board.return_fen()
+        for _ in range(iterations):
+            #set_fenはFEN_CACHEを引くので, 毎回パースさせるためにキャッシュを通さない
+            board.set_position(*parse_fen_uncached(fen))
+            board.return_fen()
+            count += 1
+    return count
+
+def bench_is_check(boards, iterations):
+    count = 0
+    for board in boards:
+        for _ in range(iterations):
+            board.is_check()
+            count += 1
+    return count
+
+BENCHMARKS = (('legal_moves', bench_legal_moves), ('push_pop', bench_push_pop),
+              ('set_fen_return_fen', bench_fen), ('is_check', bench_is_check))
+
+def run_benchmarks(iterations, positions=POSITIONS):
+    results = []
+    for name, func in BENCHMARKS:
+        #move_cacheを使わずに毎回計算させる
+        boards = [Board(fen) for _, fen, _ in positions]
+        start = time.perf_counter()
+        calls = func(boards, iterations)
+        seconds = time.perf_counter() - start
+        results.append({'name': name, 'calls': calls, 'seconds': seconds,
+                        'calls_per_second': calls / seconds if seconds > 0 else 0.0})
+    return results
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m Katatsumuri_Chess.bench')
+    parser.add_argument('--depth', type=int, default=3, help='perft depth (0 to skip perft)')
+    parser.add_argument('--iterations', type=int, default=200, help='iterations per position for micro benchmarks')
+    parser.add_argument('--json', metavar='PATH', help="write results as JSON ('-' for stdout)")
+    args = parser.parse_args(argv)
+
+    perft_results = []
+    if args.depth > 0:
+        perft_results = run_perft(args.depth)
+    bench_results = []
+    if args.iterations > 0:
+        bench_results = run_benchmarks(args.iterations)
+    report = {'version': sys.version.split()[0], 'perft': perft_results, 'benchmarks': bench_results}
+
+    if args.json == '-':
+        json.dump(report, sys.stdout, indent=2)
+        print()
+    else:
+        if args.json != None:
+            with open(args.json, 'w') as f:
+                json.dump(report, f, indent=2)
+        for r in perft_results:
+            status = 'ok' if r['ok'] else 'MISMATCH (expected {})'.format(r['expected'])
+            print('perft {:<20} depth {} {:>12} nodes {:>10.0f} nps {:>8.2f}s {}'.format(
+                r['name'], r['depth'], r['nodes'], r['nps'], r['seconds'], status))
+        for r in bench_results:
+            print('{:<26} {:>10} calls {:>12.0f} calls/s'.format(r['name'], r['calls'], r['calls_per_second']))
+    #perftの結果が合わなければ失敗として終了する
+    if all(r['ok'] for r in perft_results):
+        return 0
+    return 1
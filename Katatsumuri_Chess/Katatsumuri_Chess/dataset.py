@@ -0,0 +1,180 @@
+"""
+This file is part of Katatsumuri_Chess
+
+Copyright (c) 2022 YuaHyodo
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+import mmap
+import os
+import struct
+
+from . import Board, POSITION_STRUCT
+
+#ファイル形式: ヘッダ(8バイト) + 固定長レコード
+#レコード: Board.to_bytes()の32バイト + 指し手(2バイト, 任意) + ラベル(float32, 任意)
+MAGIC = b'KCDS'
+VERSION = 1
+HEADER_STRUCT = struct.Struct('<4sHH')
+HAS_MOVE = 1
+HAS_LABEL = 2
+
+def record_size(flags):
+    size = POSITION_STRUCT.size
+    if flags & HAS_MOVE:
+        size += 2
+    if flags & HAS_LABEL:
+        size += 4
+    return size
+
+def read_header(f):
+    data = f.read(HEADER_STRUCT.size)
+    if len(data) != HEADER_STRUCT.size:
+        raise ValueError('not a Katatsumuri_Chess dataset')
+    magic, version, flags = HEADER_STRUCT.unpack(data)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError('not a Katatsumuri_Chess dataset')
+    return flags
+
+class DatasetWriter:
+    def __init__(self, path, moves=False, labels=False, append=False):
+        self.flags = HAS_MOVE * bool(moves) | HAS_LABEL * bool(labels)
+        if append and os.path.exists(path) and os.path.getsize(path) > 0:
+            with open(path, 'rb') as f:
+                if read_header(f) != self.flags:
+                    raise ValueError('record format does not match existing dataset')
+            self.file = open(path, 'ab')
+        else:
+            self.file = open(path, 'wb')
+            self.file.write(HEADER_STRUCT.pack(MAGIC, VERSION, self.flags))
+        self.move_struct = struct.Struct('<H')
+        self.label_struct = struct.Struct('<f')
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+        return False
+
+    def write(self, board, move=None, label=None):
+        if isinstance(board, Board):
+            data = board.to_bytes()
+            if type(move) == str:
+                move = board.parse_uci(move)
+        else:
+            data = bytes(board)
+        if len(data) != POSITION_STRUCT.size:
+            raise ValueError('invalid binary position')
+        if self.flags & HAS_MOVE:
+            data += self.move_struct.pack(move or 0)
+        if self.flags & HAS_LABEL:
+            data += self.label_struct.pack(label or 0.0)
+        self.file.write(data)
+        return
+
+    def close(self):
+        self.file.close()
+        return
+
+class Dataset:
+    def __init__(self, path):
+        self.file = open(path, 'rb')
+        self.flags = read_header(self.file)
+        self.record_size = record_size(self.flags)
+        size = os.path.getsize(path)
+        self.count = (size - HEADER_STRUCT.size) // self.record_size
+        if self.count > 0:
+            self.mmap = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+            self.view = memoryview(self.mmap)[HEADER_STRUCT.size:HEADER_STRUCT.size + self.count * self.record_size]
+        else:
+            self.mmap = None
+            self.view = memoryview(b'')
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+        return False
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, index):
+        return self.board(index)
+
+    def __iter__(self):
+        for i in range(self.count):
+            yield self.board(i)
+
+    def record(self, index):
+        #コピーせずにmmap上のレコードを指すmemoryviewを返す
+        if index < 0:
+            index += self.count
+        if not 0 <= index < self.count:
+            raise IndexError('dataset index out of range')
+        return self.view[index * self.record_size:(index + 1) * self.record_size]
+
+    def board(self, index, move_cache=None):
+        return Board.from_bytes(self.record(index)[:POSITION_STRUCT.size], move_cache)
+
+    def move(self, index):
+        if not self.flags & HAS_MOVE:
+            return None
+        return struct.unpack_from('<H', self.record(index), POSITION_STRUCT.size)[0]
+
+    def label(self, index):
+        if not self.flags & HAS_LABEL:
+            return None
+        offset = POSITION_STRUCT.size + 2 * bool(self.flags & HAS_MOVE)
+        return struct.unpack_from('<f', self.record(index), offset)[0]
+
+    def dtype(self):
+        import numpy as np
+        fields = [('occupied', '<u8'), ('pieces', 'u1', (16,)), ('flags', 'u1'), ('ep_square', 'u1'),
+                  ('halfmove', '<u2'), ('fullmove', '<u4')]
+        if self.flags & HAS_MOVE:
+            fields.append(('move', '<u2'))
+        if self.flags & HAS_LABEL:
+            fields.append(('label', '<f4'))
+        return np.dtype(fields)
+
+    def as_array(self):
+        #NumPyの構造化配列としてmmapをそのまま参照する (読み取り専用)
+        import numpy as np
+        return np.frombuffer(self.view, dtype=self.dtype(), count=self.count)
+
+    def close(self):
+        #record()やas_array()で作った配列が残っている間はmmapを閉じられないので,
+        #その時は参照だけを外して, 残った配列が無くなった時にGCで閉じさせる
+        try:
+            self.view.release()
+        except BufferError:
+            pass
+        if self.mmap != None:
+            try:
+                self.mmap.close()
+            except BufferError:
+                pass
+            self.mmap = None
+        self.view = memoryview(b'')
+        self.file.close()
+        return
@@ -0,0 +1,357 @@
+"""
+This file is part of Katatsumuri_Chess
+
+Copyright (c) 2022 YuaHyodo
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+from collections import namedtuple
+import time
+
+from . import WHITE, BB_SQUARES, PIECE_VALUES, FLAG_MASK, PROMOTION, EN_PASSANT, move_promotion
+
+SearchResult = namedtuple('SearchResult', ['best_move', 'score', 'depth', 'nodes', 'time', 'pv'])
+
+INFINITY = 1000000
+MATE_SCORE = 100000
+MATE_BOUND = MATE_SCORE - 1000
+MAX_PLY = 128
+DEFAULT_DEPTH = 5
+EXACT, LOWER, UPPER = range(3)
+
+class SearchStopped(Exception):
+    pass
+
+def score_to_tt(score, ply):
+    #詰みの評価値はルートからの手数ではなく, その局面からの手数にして保存する
+    if score >= MATE_BOUND:
+        return score + ply
+    if score <= -MATE_BOUND:
+        return score - ply
+    return score
+
+def score_from_tt(score, ply):
+    if score >= MATE_BOUND:
+        return score - ply
+    if score <= -MATE_BOUND:
+        return score + ply
+    return score
+
+class TranspositionTable:
+    #PerftTableと同じく固定サイズで, 同じ局面か深い探索の結果で置き換える
+    def __init__(self, size=1 << 18):
+        self.size = size
+        self.clear()
+
+    def get(self, key):
+        index = key % self.size
+        if self.keys[index] == key:
+            return self.depths[index], self.scores[index], self.flags[index], self.moves[index]
+        return None
+
+    def put(self, key, depth, score, flag, move):
+        index = key % self.size
+        if self.keys[index] == key or self.depths[index] <= depth:
+            self.keys[index] = key
+            self.depths[index] = depth
+            self.scores[index] = score
+            self.flags[index] = flag
+            self.moves[index] = move
+        return
+
+    def clear(self):
+        self.keys = [0] * self.size
+        self.depths = [-1] * self.size
+        self.scores = [0] * self.size
+        self.flags = [EXACT] * self.size
+        self.moves = [0] * self.size
+        return
+
+class Engine:
+    def __init__(self, tt_size=1 << 18):
+        self.tt = TranspositionTable(tt_size)
+        self.killers = [[0, 0] for _ in range(MAX_PLY + 1)]
+        self.history = [[0] * 64 for _ in range(12)]
+        self.nodes = 0
+        self.next_check = 0
+        self.deadline = None
+        self.node_limit = None
+        self.stop = None
+        self.root_best = None
+
+    def new_game(self):
+        self.tt.clear()
+        self.history = [[0] * 64 for _ in range(12)]
+        return
+
+    def evaluate(self, board):
+        #手番側から見た駒の価値と位置の評価値
+        if board.turn_of == WHITE:
+            return board.psq_score
+        return -board.psq_score
+
+    def check_limits(self):
+        if self.stop != None and self.stop.is_set():
+            raise SearchStopped
+        if self.deadline != None and time.perf_counter() >= self.deadline:
+            raise SearchStopped
+        if self.node_limit != None and self.nodes >= self.node_limit:
+            raise SearchStopped
+        self.next_check = self.nodes + 1024
+        if self.node_limit != None:
+            self.next_check = min(self.next_check, self.node_limit)
+        return
+
+    def search(self, board, depth=None, movetime=None, nodes=None, stop=None, info=None):
+        #探索中に止めても元の局面が壊れないようにコピーを使う
+        board = board.copy()
+        start = time.perf_counter()
+        if depth == None:
+            if movetime == None and nodes == None and stop == None:
+                depth = DEFAULT_DEPTH
+            else:
+                depth = MAX_PLY - 1
+        self.deadline = None
+        if movetime != None:
+            self.deadline = start + movetime
+        self.node_limit = nodes
+        self.stop = stop
+        self.nodes = 0
+        self.next_check = 0
+        self.killers = [[0, 0] for _ in range(MAX_PLY + 1)]
+        for table in self.history:
+            for sq in range(64):
+                table[sq] >>= 1
+
+        moves = board.generate_legal_moves()
+        if len(moves) == 0:
+            score = -MATE_SCORE if board.is_check() else 0
+            return SearchResult(None, score, 0, 0, time.perf_counter() - start, [])
+        result = SearchResult(moves[0], self.evaluate(board), 0, 0, 0.0, [moves[0]])
+        for current_depth in range(1, depth + 1):
+            self.root_best = None
+            try:
+                score, best_move = self.search_root(board, current_depth, moves)
+            except SearchStopped:
+                #ルートでは前回の最善手から読むので, 途中で止めても見つかった手はそれ以上に良い
+                if self.root_best != None and self.root_best[0] != result.best_move:
+                    result = result._replace(best_move=self.root_best[0], score=self.root_best[1],
+                                             pv=[self.root_best[0]])
+                break
+            elapsed = time.perf_counter() - start
+            result = SearchResult(best_move, score, current_depth, self.nodes, elapsed,
+                                  self.principal_variation(board, best_move, current_depth))
+            if info != None:
+                info(result)
+            if abs(score) >= MATE_BOUND and MATE_SCORE - abs(score) <= current_depth:
+                break
+            if self.deadline != None and elapsed * 2 >= movetime:
+                break
+        return result._replace(nodes=self.nodes, time=time.perf_counter() - start)
+
+    def search_root(self, board, depth, moves):
+        entry = self.tt.get(board.zobrist_key)
+        tt_move = 0
+        if entry != None:
+            tt_move = entry[3]
+        alpha = -INFINITY
+        best_move = 0
+        for move in self.order_moves(board, moves, tt_move, 0):
+            board.push_move(move)
+            self.nodes += 1
+            score = -self.negamax(board, depth - 1, -INFINITY, -alpha, 1)
+            board.pop()
+            if score > alpha:
+                alpha = score
+                best_move = move
+                self.root_best = (move, score)
+        self.tt.put(board.zobrist_key, depth, score_to_tt(alpha, 0), EXACT, best_move)
+        return alpha, best_move
+
+    def negamax(self, board, depth, alpha, beta, ply):
+        if self.nodes >= self.next_check:
+            self.check_limits()
+        #50手ルールと, 探索中か棋譜中に一度出た局面は引き分けとする
+        if board.move_count[0] >= 100 or board.key_counts.get(board.zobrist_key, 0) >= 2:
+            return 0
+        in_check = board.is_check()
+        if in_check:
+            depth += 1
+        if depth <= 0:
+            return self.quiescence(board, alpha, beta, ply)
+
+        key = board.zobrist_key
+        tt_move = 0
+        entry = self.tt.get(key)
+        if entry != None:
+            entry_depth, entry_score, entry_flag, tt_move = entry
+            if entry_depth >= depth:
+                entry_score = score_from_tt(entry_score, ply)
+                if entry_flag == EXACT:
+                    return entry_score
+                if entry_flag == LOWER and entry_score >= beta:
+                    return entry_score
+                if entry_flag == UPPER and entry_score <= alpha:
+                    return entry_score
+
+        if ply >= MAX_PLY:
+            return self.evaluate(board)
+
+        alpha_orig = alpha
+        best_score = -INFINITY
+        best_move = 0
+        for move in self.staged_moves(board, tt_move, ply):
+            board.push_move(move)
+            self.nodes += 1
+            score = -self.negamax(board, depth - 1, -beta, -alpha, ply + 1)
+            board.pop()
+            if score > best_score:
+                best_score = score
+                best_move = move
+                if score > alpha:
+                    alpha = score
+                    if alpha >= beta:
+                        if not self.is_tactical(board, move):
+                            self.update_quiet(board, move, depth, ply)
+                        break
+        if best_move == 0:
+            #合法手が無い
+            if in_check:
+                return -MATE_SCORE + ply
+            return 0
+
+        if best_score <= alpha_orig:
+            flag = UPPER
+        elif best_score >= beta:
+            flag = LOWER
+        else:
+            flag = EXACT
+        self.tt.put(key, depth, score_to_tt(best_score, ply), flag, best_move)
+        return best_score
+
+    def quiescence(self, board, alpha, beta, ply):
+        if self.nodes >= self.next_check:
+            self.check_limits()
+        in_check = board.is_check()
+        if in_check:
+            #王手されている時は全ての応手を読む
+            best_score = -INFINITY
+        else:
+            best_score = self.evaluate(board)
+            if best_score >= beta or ply >= MAX_PLY:
+                return best_score
+            if best_score > alpha:
+                alpha = best_score
+        if in_check:
+            moves = board.generate_legal_moves()
+            if len(moves) == 0:
+                return -MATE_SCORE + ply
+            if ply >= MAX_PLY:
+                return self.evaluate(board)
+        else:
+            #駒を取る手と成る手だけを生成する
+            moves = list(board.generate_staged_moves(True, False, False))
+        for move in self.order_moves(board, moves, 0, ply):
+            board.push_move(move)
+            self.nodes += 1
+            score = -self.quiescence(board, -beta, -alpha, ply + 1)
+            board.pop()
+            if score > best_score:
+                best_score = score
+                if score > alpha:
+                    alpha = score
+                    if alpha >= beta:
+                        break
+        return best_score
+
+    def is_tactical(self, board, move):
+        #駒を取る手と成る手
+        return board.mailbox[move & 63] != None or move & FLAG_MASK in (PROMOTION, EN_PASSANT)
+
+    def update_quiet(self, board, move, depth, ply):
+        killers = self.killers[ply]
+        if killers[0] != move:
+            killers[1] = killers[0]
+            killers[0] = move
+        table = self.history[board.mailbox[(move >> 6) & 63]]
+        table[move & 63] += depth * depth
+        if table[move & 63] > 100000:
+            for history in self.history:
+                for sq in range(64):
+                    history[sq] >>= 1
+        return
+
+    def staged_moves(self, board, tt_move, ply):
+        #置換表の手, 駒を取る手, それ以外の手の順に生成する. 途中でカットされれば後の段階の手は生成しない
+        if tt_move != 0 and tt_move in board.generate_legal_moves(BB_SQUARES[(tt_move >> 6) & 63]):
+            yield tt_move
+        else:
+            tt_move = 0
+        captures = [move for move in board.generate_staged_moves(True, False, False) if move != tt_move]
+        yield from self.order_moves(board, captures, 0, ply)
+        quiets = [move for move in board.generate_staged_moves(False, True, True) if move != tt_move]
+        yield from self.order_moves(board, quiets, 0, ply)
+        return
+
+    def order_moves(self, board, moves, tt_move, ply):
+        #置換表の手, MVV-LVAで並べた駒を取る手, キラー手, ヒストリーの順
+        mailbox = board.mailbox
+        killer1, killer2 = self.killers[ply]
+        history = self.history
+        scored = []
+        for move in moves:
+            to_sq = move & 63
+            from_sq = (move >> 6) & 63
+            if move == tt_move:
+                score = 10000000
+            else:
+                victim = mailbox[to_sq]
+                flag = move & FLAG_MASK
+                if victim != None:
+                    score = 1000000 + 10 * PIECE_VALUES[victim % 6] - mailbox[from_sq] % 6
+                elif flag == EN_PASSANT:
+                    score = 1000000 + 10 * PIECE_VALUES[0]
+                elif move == killer1:
+                    score = 900000
+                elif move == killer2:
+                    score = 800000
+                else:
+                    score = history[mailbox[from_sq]][to_sq]
+                if flag == PROMOTION:
+                    score += 500000 + PIECE_VALUES[move_promotion(move)]
+            scored.append((score, move))
+        scored.sort(reverse=True)
+        return [move for _, move in scored]
+
+    def principal_variation(self, board, best_move, depth):
+        #置換表をたどって読み筋を作る
+        pv = [best_move]
+        board = board.copy()
+        board.push_move(best_move)
+        while len(pv) < depth:
+            entry = self.tt.get(board.zobrist_key)
+            if entry == None or entry[3] not in board.generate_legal_moves():
+                break
+            pv.append(entry[3])
+            board.push_move(entry[3])
+        return pv
+
+def search(board, depth=None, movetime=None, nodes=None, stop=None, info=None):
+    return Engine().search(board, depth, movetime, nodes, stop, info)
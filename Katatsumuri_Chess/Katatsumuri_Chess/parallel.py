@@ -0,0 +1,82 @@
+"""
+This file is part of Katatsumuri_Chess
+
+Copyright (c) 2022 YuaHyodo
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+import os
+
+from . import Board, PerftTable, int_to_uci
+
+PerftResult = namedtuple('PerftResult', ['nodes', 'divide'])
+
+#ワーカープロセスごとに1つだけ作る置換表
+worker_table = None
+
+def init_worker(table_size):
+    global worker_table
+    worker_table = None
+    if table_size > 0:
+        worker_table = PerftTable(table_size)
+    return
+
+def perft_task(data, depth):
+    return Board.from_bytes(data).perft(depth, worker_table)
+
+def split_positions(board, split_depth, root_move=None, tasks=None):
+    #split_depth手先の局面をバイナリ形式で集める. 同じ局面は1回だけ数えるようにまとめる
+    if tasks == None:
+        tasks = {}
+    if split_depth == 0:
+        tasks.setdefault(board.to_bytes(), []).append(root_move)
+        return tasks
+    for move in board.generate_legal_moves():
+        board.push_move(move)
+        split_positions(board, split_depth - 1, int_to_uci(move) if root_move == None else root_move, tasks)
+        board.pop()
+    return tasks
+
+def perft_parallel(board, depth, workers=None, split_depth=1, table_size=0):
+    if workers == None:
+        workers = os.cpu_count() or 1
+    if depth == 0:
+        return PerftResult(1, {})
+    board = board.copy(stack=False)
+    divide = {int_to_uci(move): 0 for move in board.generate_legal_moves()}
+    if depth == 1:
+        divide = dict.fromkeys(divide, 1)
+        return PerftResult(len(divide), divide)
+    split_depth = max(1, min(split_depth, depth - 1))
+    tasks = split_positions(board, split_depth)
+    positions = list(tasks.keys())
+    if workers <= 1:
+        init_worker(table_size)
+        counts = [perft_task(data, depth - split_depth) for data in positions]
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=init_worker, initargs=(table_size,)) as executor:
+            chunksize = max(1, len(positions) // (workers * 8))
+            counts = list(executor.map(perft_task, positions, [depth - split_depth] * len(positions), chunksize=chunksize))
+    for data, nodes in zip(positions, counts):
+        for uci in tasks[data]:
+            divide[uci] += nodes
+    return PerftResult(sum(divide.values()), divide)
@@ -0,0 +1,151 @@
+"""
+This file is part of Katatsumuri_Chess
+
+Copyright (c) 2022 YuaHyodo
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+from collections import namedtuple
+import re
+
+from . import Board, COLOR_INDEX, BB_FILES, BB_RANKS, SQUARE_INDEX, KING, PAWN, CASTLING, FLAG_MASK, move_promotion
+
+Game = namedtuple('Game', ['headers', 'moves', 'result'])
+
+RESULTS = ('1-0', '0-1', '1/2-1/2', '*')
+TAG_RE = re.compile(r'\[\s*(\w+)\s+"((?:[^"\\]|\\.)*)"\s*\]')
+TOKEN_RE = re.compile(r'\{[^}]*\}?|;[^\n]*|\$\d+|[()]|1-0|0-1|1/2-1/2|\*|\d+\.+|[^\s{}();$]+')
+SAN_RE = re.compile(r'([NBRQK])?([a-h])?([1-8])?x?([a-h][1-8])(?:=?([NBRQnbrq]))?$')
+SAN_PIECES = {'N': 1, 'B': 2, 'R': 3, 'Q': 4, 'K': 5}
+
+def parse_san(board, san):
+    #動かす駒の種類と筋, 段で絞った上で合法手生成に任せる
+    san = san.rstrip('+#!?')
+    color = COLOR_INDEX[board.turn_of]
+    if san in ('O-O', '0-0', 'O-O-O', '0-0-0'):
+        file = 6 if len(san) == 3 else 2
+        for move in board.generate_legal_moves(board.pieces_bb[color * 6 + KING]):
+            if move & FLAG_MASK == CASTLING and move % 8 == file:
+                return move
+        raise ValueError('illegal san: ' + san)
+    match = SAN_RE.match(san)
+    if match == None:
+        raise ValueError('invalid san: ' + san)
+    piece, file, rank, to_square, promotion = match.groups()
+    from_mask = board.pieces_bb[color * 6 + SAN_PIECES.get(piece, PAWN)]
+    if file != None:
+        from_mask &= BB_FILES['abcdefgh'.index(file)]
+    if rank != None:
+        from_mask &= BB_RANKS[8 - int(rank)]
+    if promotion != None:
+        promotion = SAN_PIECES[promotion.upper()]
+    to_sq = SQUARE_INDEX[to_square]
+    found = None
+    for move in board.generate_legal_moves(from_mask):
+        if move & 63 == to_sq and move_promotion(move) == promotion:
+            if found != None:
+                raise ValueError('ambiguous san: ' + san)
+            found = move
+    if found == None:
+        raise ValueError('illegal san: ' + san)
+    return found
+
+def scan_comment(line, in_comment):
+    #複数行にまたがる{}コメントの中にいるかどうかを追跡する
+    for ch in line:
+        if in_comment:
+            if ch == '}':
+                in_comment = False
+        elif ch == '{':
+            in_comment = True
+        elif ch == ';':
+            break
+    return in_comment
+
+def parse_movetext(headers, movetext):
+    moves = []
+    result = headers.get('Result', '*')
+    depth = 0
+    for token in TOKEN_RE.findall(''.join(movetext)):
+        first = token[0]
+        if first == '(':
+            depth += 1
+        elif first == ')':
+            depth -= 1
+        elif depth > 0 or first in '{;$' or token[-1] == '.':
+            continue
+        elif token in RESULTS:
+            result = token
+        else:
+            moves.append(token)
+    return Game(headers, moves, result)
+
+def read_games(source):
+    #ファイル全体を読み込まずに1局ずつ返す
+    if isinstance(source, str):
+        with open(source, encoding='utf-8', errors='replace') as f:
+            yield from read_games(f)
+        return
+    headers = {}
+    movetext = []
+    in_comment = False
+    for line in source:
+        if not in_comment:
+            stripped = line.strip()
+            if stripped == '' or stripped[0] == '%':
+                continue
+            if stripped[0] == '[':
+                if movetext:
+                    yield parse_movetext(headers, movetext)
+                    headers = {}
+                    movetext = []
+                match = TAG_RE.match(stripped)
+                if match != None:
+                    headers[match.group(1)] = match.group(2).replace('\\"', '"').replace('\\\\', '\\')
+                continue
+        if in_comment or '{' in line:
+            in_comment = scan_comment(line, in_comment)
+        movetext.append(line)
+    if headers or movetext:
+        yield parse_movetext(headers, movetext)
+    return
+
+def replay(game, board=None):
+    #1手指すごとに(指し手, 局面)を返す. 局面は同じBoardオブジェクトを使い回す
+    if board == None:
+        board = Board(game.headers.get('FEN'))
+    for san in game.moves:
+        move = parse_san(board, san)
+        board.push_move(move)
+        yield move, board
+    return
+
+def replay_games(source, callback, skip_invalid=False):
+    count = 0
+    for game in read_games(source):
+        try:
+            for move, board in replay(game):
+                callback(game, move, board)
+        except ValueError:
+            if not skip_invalid:
+                raise
+            continue
+        count += 1
+    return count
@@ -0,0 +1,55 @@
+"""
+This file is part of Katatsumuri_Chess
+
+Copyright (c) 2022 YuaHyodo
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+from itertools import chain
+
+from .Pieces import BLACK
+
+#駒の面は駒コード順(PNBRQKpnbrqk), 各面の[row][col]はsquares[row][col]と同じ並び
+FEATURE_NAMES = ('turn', 'white_kingside', 'white_queenside', 'black_kingside', 'black_queenside', 'ep_file')
+NUM_PLANES = 12
+NUM_FEATURES = len(FEATURE_NAMES)
+
+def boards_to_planes(boards, out=None, features_out=None):
+    #NumPyは必要な時だけ読み込む
+    import numpy as np
+    n = len(boards)
+    if out is None:
+        out = np.empty((n, NUM_PLANES, 8, 8), dtype=np.uint8)
+    if features_out is None:
+        features_out = np.empty((n, NUM_FEATURES), dtype=np.uint8)
+    if out.shape != (n, NUM_PLANES, 8, 8) or features_out.shape != (n, NUM_FEATURES):
+        raise ValueError('output buffer has wrong shape')
+    if n == 0:
+        return out, features_out
+    #ビットボードをリトルエンディアンのバイト列として展開すると, 1バイトが1段, 1ビットが1列になる
+    bb = np.fromiter(chain.from_iterable(board.pieces_bb for board in boards), dtype='<u8', count=n * NUM_PLANES)
+    bits = np.unpackbits(bb.view(np.uint8), bitorder='little')
+    out[...] = bits.reshape(n, NUM_PLANES, 8, 8)
+    features_out[:, 0] = np.fromiter((board.turn_of == BLACK for board in boards), dtype=np.uint8, count=n)
+    castling = np.fromiter((board.castling_rights for board in boards), dtype=np.uint8, count=n)
+    features_out[:, 1:5] = (castling[:, None] >> np.arange(4, dtype=np.uint8)) & 1
+    features_out[:, 5] = np.fromiter((0 if board.ep_square == None else (board.ep_square & 7) + 1 for board in boards),
+                                     dtype=np.uint8, count=n)
+    return out, features_out
@@ -0,0 +1,217 @@
+"""
+This file is part of Katatsumuri_Chess
+
+Copyright (c) 2022 YuaHyodo
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+import sys
+import threading
+
+from . import Board, WHITE, COLOR_INDEX, CASTLING_ROOK_MOVES, FLAG_MASK, PROMOTION, CASTLING, PAWN, ROOK, int_to_uci
+from .engine import Engine, MATE_SCORE, MATE_BOUND
+
+STARTPOS = 'startpos'
+
+def format_score(score):
+    if score >= MATE_BOUND:
+        return 'mate {}'.format((MATE_SCORE - score + 1) // 2)
+    if score <= -MATE_BOUND:
+        return 'mate -{}'.format((MATE_SCORE + score) // 2)
+    return 'cp {}'.format(score)
+
+def can_push(board, move):
+    #push_moveが盤面を壊さずに指せるかだけを確認する (合法性は確認しない)
+    from_sq = (move >> 6) & 63
+    code = board.mailbox[from_sq]
+    if code == None or code // 6 != COLOR_INDEX[board.turn_of]:
+        return False
+    flag = move & FLAG_MASK
+    if flag == PROMOTION:
+        return code % 6 == PAWN
+    if flag == CASTLING:
+        rook_from = CASTLING_ROOK_MOVES[(from_sq, move & 63)][0]
+        return board.mailbox[rook_from] == code - code % 6 + ROOK
+    return True
+
+class UCI:
+    def __init__(self, output=sys.stdout):
+        self.output = output
+        self.output_lock = threading.Lock()
+        self.engine = Engine()
+        self.board = Board()
+        self.base = STARTPOS
+        self.moves = []
+        self.thread = None
+        self.stop_event = threading.Event()
+
+    def send(self, line):
+        with self.output_lock:
+            self.output.write(line + '\n')
+            self.output.flush()
+        return
+
+    def handle(self, line):
+        tokens = line.split()
+        if len(tokens) == 0:
+            return True
+        command = tokens[0]
+        if command == 'uci':
+            self.send('id name Katatsumuri_Chess')
+            self.send('id author Yua Hyodo')
+            self.send('uciok')
+        elif command == 'isready':
+            self.send('readyok')
+        elif command == 'ucinewgame':
+            self.stop()
+            self.engine.new_game()
+            self.set_position(STARTPOS, [])
+        elif command == 'position':
+            self.position(tokens[1:])
+        elif command == 'go':
+            self.go(tokens[1:])
+        elif command == 'stop':
+            self.stop()
+        elif command == 'quit':
+            self.stop()
+            return False
+        return True
+
+    def position(self, tokens):
+        if 'moves' in tokens:
+            index = tokens.index('moves')
+            moves = tokens[index + 1:]
+            tokens = tokens[:index]
+        else:
+            moves = []
+        if len(tokens) == 0:
+            return
+        if tokens[0] == 'fen':
+            base = ' '.join(tokens[1:])
+        else:
+            base = STARTPOS
+        self.set_position(base, moves)
+        return
+
+    def set_position(self, base, moves):
+        #前回と同じ局面から始まる場合は, 共通の手順まで戻してから残りの手だけを指す
+        if base != self.base:
+            try:
+                self.board = Board(None if base == STARTPOS else base)
+            except ValueError:
+                self.send('info string invalid fen')
+                return
+            self.base = base
+            self.moves = []
+        common = 0
+        for old, new in zip(self.moves, moves):
+            if old != new:
+                break
+            common += 1
+        for _ in range(len(self.moves) - common):
+            self.board.pop()
+        del self.moves[common:]
+        #GUIから送られた手は合法手とみなし, is_legalでの確認はしない
+        for move in moves[common:]:
+            try:
+                encoded = self.board.parse_uci(move)
+            except (KeyError, ValueError):
+                encoded = None
+            if encoded == None or not can_push(self.board, encoded):
+                self.send('info string invalid move ' + move)
+                break
+            self.board.push_move(encoded)
+            self.moves.append(move)
+        return
+
+    def go(self, tokens):
+        self.stop()
+        limits = {}
+        values = {}
+        infinite = False
+        i = 0
+        while i < len(tokens):
+            if tokens[i] in ('infinite', 'ponder'):
+                infinite = True
+                i += 1
+                continue
+            if i + 1 < len(tokens):
+                try:
+                    values[tokens[i]] = int(tokens[i + 1])
+                except ValueError:
+                    pass
+            i += 2
+        if 'depth' in values:
+            limits['depth'] = values['depth']
+        if 'nodes' in values:
+            limits['nodes'] = values['nodes']
+        if 'movetime' in values:
+            limits['movetime'] = values['movetime'] / 1000
+        else:
+            if self.board.turn_of == WHITE:
+                remaining, increment = values.get('wtime'), values.get('winc', 0)
+            else:
+                remaining, increment = values.get('btime'), values.get('binc', 0)
+            if remaining != None and not infinite:
+                #残り時間を残りの手数で割り, 加算時間の半分を足す
+                moves_to_go = values.get('movestogo', 30)
+                movetime = remaining / max(moves_to_go, 1) + increment / 2
+                limits['movetime'] = max(min(movetime, remaining / 2), 1) / 1000
+        self.stop_event = threading.Event()
+        self.thread = threading.Thread(target=self.run_search, args=(self.board.copy(), limits, infinite, self.stop_event))
+        self.thread.daemon = True
+        self.thread.start()
+        return
+
+    def run_search(self, board, limits, infinite, stop_event):
+        result = self.engine.search(board, stop=stop_event, info=self.send_info, **limits)
+        if infinite:
+            #infiniteの時はstopが来るまでbestmoveを返さない
+            stop_event.wait()
+        if result.best_move == None:
+            self.send('bestmove 0000')
+        else:
+            self.send('bestmove ' + int_to_uci(result.best_move))
+        return
+
+    def send_info(self, result):
+        nps = int(result.nodes / result.time) if result.time > 0 else 0
+        self.send('info depth {} score {} nodes {} nps {} time {} pv {}'.format(
+            result.depth, format_score(result.score), result.nodes, nps, int(result.time * 1000),
+            ' '.join(int_to_uci(move) for move in result.pv)))
+        return
+
+    def stop(self):
+        if self.thread != None:
+            self.stop_event.set()
+            self.thread.join()
+            self.thread = None
+        return
+
+def main(input=sys.stdin, output=sys.stdout):
+    uci = UCI(output)
+    for line in input:
+        if not uci.handle(line):
+            break
+    uci.stop()
+    return
+
+if __name__ == '__main__':
+    main()
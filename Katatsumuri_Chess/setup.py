@@ -24,4 +24,4 @@ SOFTWARE.
 from distutils.core import setup
 
 setup(name='Katatsumuri_Chess', version='0.0.1', description='Library of chess very very slow like a snail',
-         auther='Yua Hyodo', url='https://github.com/YuaHyodo/Katatsumuri_Chess', packages=['Katatsumuri_Chess'])
+         auther='Yua Hyodo', url='https://github.com/YuaHyodo/Katatsumuri_Chess', packages=['Katatsumuri_Chess', 'Katatsumuri_Chess.bench'])
@@ -0,0 +1,58 @@
+"""
+This file is part of Katatsumuri_Chess
+
+Copyright (c) 2022 YuaHyodo
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+import unittest
+
+from Katatsumuri_Chess import Board
+from Katatsumuri_Chess.batch import evaluate_fen, evaluate_fens, PositionInfo
+from Katatsumuri_Chess.bench import POSITIONS
+
+MATE = 'k7/1Q6/2K5/8/8/8/8/8 b - - 0 1'
+STALEMATE = '7k/5Q2/6K1/8/8/8/8/8 b - - 0 1'
+
+class BatchTest(unittest.TestCase):
+    def test_evaluate_fen(self):
+        info = evaluate_fen(MATE)
+        self.assertEqual(info, PositionInfo(MATE, [], True, True, False, False, [[0, 0, 0, 0, 1, 1], [0, 0, 0, 0, 0, 1]]))
+        self.assertTrue(evaluate_fen(STALEMATE).is_stalemate)
+        self.assertTrue(evaluate_fen(STALEMATE).is_draw)
+        self.assertEqual(sorted(evaluate_fen(POSITIONS[0][1]).legal_moves), sorted(Board().legal_moves()))
+
+    def test_order_and_bad_fens(self):
+        fens = [fen for _, fen, _ in POSITIONS] + ['garbage', MATE, '', STALEMATE] * 3
+        for workers in (1, 2):
+            with self.subTest(workers=workers):
+                results = list(evaluate_fens(fens, workers=workers, chunksize=3))
+                self.assertEqual([info.fen for info in results], fens)
+                for fen, info in zip(fens, results):
+                    if fen in ('garbage', ''):
+                        self.assertEqual(info, PositionInfo(fen, None, None, None, None, None, None))
+                    else:
+                        self.assertEqual(info, evaluate_fen(fen))
+
+    def test_empty_input(self):
+        self.assertEqual(list(evaluate_fens([], workers=2)), [])
+
+if __name__ == '__main__':
+    unittest.main()
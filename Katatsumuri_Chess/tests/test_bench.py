@@ -0,0 +1,48 @@
+"""
+This file is part of Katatsumuri_Chess
+
+Copyright (c) 2022 YuaHyodo
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+import io
+import json
+import unittest
+from contextlib import redirect_stdout
+
+from Katatsumuri_Chess import bench
+
+class BenchTest(unittest.TestCase):
+    def test_json_report(self):
+        output = io.StringIO()
+        with redirect_stdout(output):
+            status = bench.main(['--depth', '2', '--iterations', '1', '--json', '-'])
+        self.assertEqual(status, 0)
+        report = json.loads(output.getvalue())
+        self.assertEqual(len(report['perft']), len(bench.POSITIONS))
+        self.assertTrue(all(result['ok'] for result in report['perft']))
+        self.assertEqual([result['name'] for result in report['benchmarks']], [name for name, _ in bench.BENCHMARKS])
+
+    def test_mismatch_fails(self):
+        positions = (('startpos', bench.POSITIONS[0][1], (21,)),)
+        self.assertFalse(bench.run_perft(1, positions)[0]['ok'])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,71 @@
+"""
+This file is part of Katatsumuri_Chess
+
+Copyright (c) 2022 YuaHyodo
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+import copy
+import pickle
+import random
+import unittest
+
+from Katatsumuri_Chess import Board, POSITION_STRUCT
+from Katatsumuri_Chess.bench import POSITIONS
+
+class BinaryFormatTest(unittest.TestCase):
+    def test_round_trip(self):
+        rng = random.Random(3)
+        for name, fen, _ in POSITIONS:
+            board = Board(fen)
+            for ply in range(40):
+                data = board.to_bytes()
+                self.assertEqual(len(data), 32)
+                restored = Board.from_bytes(data)
+                self.assertEqual(restored.return_fen(), board.return_fen())
+                self.assertEqual(restored.zobrist_key, board.zobrist_key)
+                moves = board.generate_legal_moves()
+                if len(moves) == 0:
+                    break
+                board.push_move(rng.choice(moves))
+
+    def test_pickle_and_copy(self):
+        board = Board(POSITIONS[1][1])
+        self.assertEqual(pickle.loads(pickle.dumps(board)).return_fen(), board.return_fen())
+        self.assertEqual(copy.deepcopy(board).return_fen(), board.return_fen())
+
+    def test_invalid_data(self):
+        occupied, packed, flags, ep_square, halfmove, fullmove = POSITION_STRUCT.unpack(Board().to_bytes())
+        for data in [b'', b'\x00' * 31, b'\x00' * 33,
+                     POSITION_STRUCT.pack((1 << 64) - 1, packed, flags, ep_square, halfmove, fullmove),
+                     POSITION_STRUCT.pack(occupied, packed, flags, 200, halfmove, fullmove),
+                     POSITION_STRUCT.pack(occupied, packed, flags, 20, halfmove, fullmove),
+                     POSITION_STRUCT.pack(occupied, b'\xff' * 16, flags, ep_square, halfmove, fullmove)]:
+            with self.subTest(data=data):
+                with self.assertRaises(ValueError):
+                    Board.from_bytes(data)
+
+    def test_too_many_pieces(self):
+        board = Board('pppppppp/pppppppp/pppppppp/pppppppp/pppppppp/8/8/4K2k w - - 0 1')
+        with self.assertRaises(ValueError):
+            board.to_bytes()
+
+if __name__ == '__main__':
+    unittest.main()
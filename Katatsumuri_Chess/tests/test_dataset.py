@@ -0,0 +1,106 @@
+"""
+This file is part of Katatsumuri_Chess
+
+Copyright (c) 2022 YuaHyodo
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+import os
+import shutil
+import tempfile
+import unittest
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+from Katatsumuri_Chess import Board, int_to_uci
+from Katatsumuri_Chess.bench import POSITIONS
+from Katatsumuri_Chess.dataset import Dataset, DatasetWriter
+
+class DatasetTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'positions.kcds')
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_write_and_read(self):
+        with DatasetWriter(self.path, moves=True, labels=True) as writer:
+            for i, (name, fen, _) in enumerate(POSITIONS):
+                board = Board(fen)
+                writer.write(board, board.legal_moves()[0], i * 0.5)
+        with Dataset(self.path) as dataset:
+            self.assertEqual(len(dataset), len(POSITIONS))
+            self.assertEqual([board.return_fen() for board in dataset], [fen for _, fen, _ in POSITIONS])
+            self.assertEqual(dataset[-1].return_fen(), POSITIONS[-1][1])
+            self.assertEqual(int_to_uci(dataset.move(0)), Board(POSITIONS[0][1]).legal_moves()[0])
+            self.assertEqual(dataset.label(3), 1.5)
+            with self.assertRaises(IndexError):
+                dataset.record(len(POSITIONS))
+
+    def test_append_and_format_mismatch(self):
+        with DatasetWriter(self.path) as writer:
+            writer.write(Board())
+        with DatasetWriter(self.path, append=True) as writer:
+            writer.write(Board(POSITIONS[1][1]).to_bytes())
+        with Dataset(self.path) as dataset:
+            self.assertEqual(len(dataset), 2)
+            self.assertEqual(dataset.move(0), None)
+            self.assertEqual(dataset[1].return_fen(), POSITIONS[1][1])
+        with self.assertRaises(ValueError):
+            DatasetWriter(self.path, labels=True, append=True)
+
+    def test_empty_and_invalid_files(self):
+        DatasetWriter(self.path).close()
+        with Dataset(self.path) as dataset:
+            self.assertEqual(len(dataset), 0)
+        with open(self.path, 'wb') as f:
+            f.write(b'KC')
+        with self.assertRaises(ValueError):
+            Dataset(self.path)
+
+    def test_close_with_live_views(self):
+        with DatasetWriter(self.path) as writer:
+            writer.write(Board())
+        with Dataset(self.path) as dataset:
+            record = dataset.record(0)
+            part = record[:8]
+        #ビューが残っていても閉じられ, ビューはそのまま読める
+        self.assertEqual(Board.from_bytes(record).return_fen(), Board().return_fen())
+        self.assertEqual(len(bytes(part)), 8)
+        dataset.close()
+
+    @unittest.skipIf(numpy == None, 'numpy is not installed')
+    def test_as_array(self):
+        with DatasetWriter(self.path, labels=True) as writer:
+            writer.write(Board(), label=0.25)
+            writer.write(Board(POSITIONS[1][1]), label=-1.0)
+        with Dataset(self.path) as dataset:
+            array = dataset.as_array()
+            self.assertEqual(array.shape, (2,))
+            self.assertEqual(list(array['label']), [0.25, -1.0])
+            self.assertEqual(int(array['occupied'][0]), Board().occupied)
+            del array
+
+if __name__ == '__main__':
+    unittest.main()
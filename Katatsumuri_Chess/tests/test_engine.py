@@ -0,0 +1,76 @@
+"""
+This file is part of Katatsumuri_Chess
+
+Copyright (c) 2022 YuaHyodo
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+import threading
+import unittest
+
+from Katatsumuri_Chess import Board, int_to_uci
+from Katatsumuri_Chess.engine import Engine, search, MATE_BOUND
+
+class EngineTest(unittest.TestCase):
+    def test_mate_in_one(self):
+        board = Board('6k1/5ppp/8/8/8/8/8/R5K1 w - - 0 1')
+        result = search(board, depth=3)
+        self.assertEqual(int_to_uci(result.best_move), 'a1a8')
+        self.assertGreaterEqual(result.score, MATE_BOUND)
+        self.assertEqual(result.pv[0], result.best_move)
+
+    def test_board_unchanged(self):
+        board = Board('r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1')
+        fen = board.return_fen()
+        key = board.zobrist_key
+        result = search(board, depth=2)
+        self.assertIn(result.best_move, board.generate_legal_moves())
+        self.assertEqual(board.return_fen(), fen)
+        self.assertEqual(board.zobrist_key, key)
+        self.assertEqual(len(board.undo_stack), 0)
+
+    def test_limits(self):
+        board = Board()
+        result = search(board, depth=2)
+        self.assertEqual(result.depth, 2)
+        result = search(board, nodes=500)
+        self.assertLessEqual(result.nodes, 500)
+        self.assertIn(result.best_move, board.generate_legal_moves())
+        stop = threading.Event()
+        stop.set()
+        result = search(board, stop=stop)
+        self.assertEqual(result.depth, 0)
+        self.assertIn(result.best_move, board.generate_legal_moves())
+
+    def test_no_legal_moves(self):
+        result = search(Board('7k/5Q2/6K1/8/8/8/8/8 b - - 0 1'), depth=2)
+        self.assertEqual(result.best_move, None)
+        self.assertEqual(result.score, 0)
+        result = search(Board('R5k1/5ppp/8/8/8/8/8/6K1 b - - 0 1'), depth=2)
+        self.assertEqual(result.best_move, None)
+        self.assertLessEqual(result.score, -MATE_BOUND)
+
+    def test_info_callback(self):
+        depths = []
+        Engine().search(Board(), depth=3, info=lambda result: depths.append(result.depth))
+        self.assertEqual(depths, [1, 2, 3])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,70 @@
+"""
+This file is part of Katatsumuri_Chess
+
+Copyright (c) 2022 YuaHyodo
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+import unittest
+
+from Katatsumuri_Chess import Board, parse_fen, parse_fen_uncached
+from Katatsumuri_Chess.bench import POSITIONS
+
+class FenTest(unittest.TestCase):
+    def test_round_trip(self):
+        for name, fen, _ in POSITIONS:
+            self.assertEqual(Board(fen).return_fen(), fen)
+
+    def test_four_fields(self):
+        self.assertEqual(Board('4k3/8/8/8/8/8/8/4K3 b - -').return_fen(), '4k3/8/8/8/8/8/8/4K3 b - - 0 1')
+
+    def test_cached_parse_matches_uncached(self):
+        fen = POSITIONS[1][1]
+        self.assertEqual(parse_fen(fen), parse_fen_uncached(fen))
+        self.assertIs(parse_fen(fen), parse_fen(fen))
+
+    def test_return_fen_after_moves(self):
+        board = Board()
+        board.push('e2e4')
+        self.assertEqual(board.return_fen(), 'rnbqkbnr/pppppppp/8/8/4P3/8/PPPP1PPP/RNBQKBNR b KQkq e3 0 1')
+        board.pop()
+        self.assertEqual(board.return_fen(), 'rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1')
+
+    def test_invalid_fens(self):
+        for fen in ['', 'garbage', '8/8/8/8/8/8/8 w - - 0 1', '9/8/8/8/8/8/8/8 w - - 0 1',
+                    '4k3/8/8/8/8/8/8/4K2X w - - 0 1', '4k3/8/8/8/8/8/8/4K3 x - - 0 1',
+                    '4k3/8/8/8/8/8/8/4K3 w A - 0 1', '4k3/8/8/8/8/8/8/4K3 w - z9 0 1',
+                    '4k3/8/8/8/8/8/8/4K3 w - - a 1', '4k3/8/8/8/8/8/8/4K3 w - - 0']:
+            with self.subTest(fen=fen):
+                with self.assertRaises(ValueError):
+                    Board(fen)
+
+    def test_en_passant_square(self):
+        self.assertIn('d5e6', Board('4k3/8/8/3Pp3/8/8/8/4K3 w - e6 0 1').legal_moves())
+        self.assertIn('d4e3', Board('4k3/8/8/8/3pP3/8/8/4K3 b - e3 0 1').legal_moves())
+        #ランクが違う, 取られるポーンがいない, マスが埋まっている
+        for fen in ['4k3/8/8/3Pp3/8/8/8/4K3 w - e3 0 1', '4k3/8/8/3P4/8/8/8/4K3 w - e6 0 1',
+                    '4k3/8/4n3/3Pp3/8/8/8/4K3 w - e6 0 1', '4k3/8/8/8/3pP3/8/8/4K3 w - e3 0 1']:
+            with self.subTest(fen=fen):
+                with self.assertRaises(ValueError):
+                    Board(fen)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,95 @@
+"""
+This file is part of Katatsumuri_Chess
+
+Copyright (c) 2022 YuaHyodo
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+import random
+import unittest
+
+from Katatsumuri_Chess import Board, LRUCache, WHITE, BLACK
+from Katatsumuri_Chess.bench import POSITIONS
+
+class MakeUnmakeTest(unittest.TestCase):
+    def test_push_pop_restores_position(self):
+        rng = random.Random(0)
+        for name, fen, _ in POSITIONS:
+            for game in range(20):
+                board = Board(fen)
+                history = []
+                for ply in range(60):
+                    moves = board.generate_legal_moves()
+                    if len(moves) == 0:
+                        break
+                    history.append((board.return_fen(), board.zobrist_key, dict(board.key_counts)))
+                    board.push_move(rng.choice(moves))
+                while len(history) != 0:
+                    board.pop()
+                    fen_before, key_before, counts_before = history.pop()
+                    self.assertEqual(board.return_fen(), fen_before)
+                    self.assertEqual(board.zobrist_key, key_before)
+                    self.assertEqual(board.key_counts, counts_before)
+
+    def test_en_passant_capture_and_undo(self):
+        board = Board('4k3/8/8/3Pp3/8/8/8/4K3 w - e6 0 1')
+        board.push('d5e6')
+        self.assertEqual(board.return_fen(), '4k3/8/4P3/8/8/8/8/4K3 b - - 0 1')
+        board.pop()
+        self.assertEqual(board.return_fen(), '4k3/8/8/3Pp3/8/8/8/4K3 w - e6 0 1')
+
+class StateSetterTest(unittest.TestCase):
+    #直接書き換えた時もハッシュ値と合法手のキャッシュが古いまま残らない
+    def assertConsistent(self, board):
+        self.assertEqual(board.zobrist_key, board.compute_zobrist())
+        self.assertEqual(board.key_counts, {board.zobrist_key: 1})
+        self.assertEqual(sorted(board.legal_moves()), sorted(Board(board.return_fen()).legal_moves()))
+
+    def test_castling_ability(self):
+        board = Board(move_cache=LRUCache(16))
+        board.legal_moves()
+        board.CastlingAbility[WHITE][0] = False
+        self.assertEqual(board.return_fen(), 'rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w Qkq - 0 1')
+        board.CastlingAbility[BLACK] = [False, False]
+        self.assertEqual(board.CastlingAbility[BLACK], [False, False])
+        self.assertConsistent(board)
+
+    def test_enpassant_square(self):
+        board = Board('4k3/8/8/3Pp3/8/8/8/4K3 w - - 0 1', move_cache=LRUCache(16))
+        board.legal_moves()
+        board.enpassant_square = 'e6'
+        self.assertIn('d5e6', board.legal_moves())
+        self.assertConsistent(board)
+        board.enpassant_square = None
+        self.assertNotIn('d5e6', board.legal_moves())
+        self.assertConsistent(board)
+
+    def test_turn_of(self):
+        board = Board('4k3/8/8/8/8/8/8/4K3 w - - 0 1', move_cache=LRUCache(16))
+        board.legal_moves()
+        board.turn_of = BLACK
+        self.assertEqual(board.return_fen(), '4k3/8/8/8/8/8/8/4K3 b - - 0 1')
+        self.assertIn('e8d8', board.legal_moves())
+        self.assertConsistent(board)
+        with self.assertRaises(ValueError):
+            board.turn_of = 'RED'
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,64 @@
+"""
+This file is part of Katatsumuri_Chess
+
+Copyright (c) 2022 YuaHyodo
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+import random
+import unittest
+
+from Katatsumuri_Chess import Board
+from Katatsumuri_Chess.bench import POSITIONS
+
+class MaterialTest(unittest.TestCase):
+    def test_counters_follow_push_pop_and_copy(self):
+        rng = random.Random(4)
+        for name, fen, _ in POSITIONS:
+            board = Board(fen)
+            for ply in range(60):
+                moves = board.generate_legal_moves()
+                if len(moves) == 0:
+                    break
+                board.push_move(rng.choice(moves))
+                if rng.random() < 0.2:
+                    board.pop()
+                snapshot = board.copy()
+                fresh = Board(board.return_fen())
+                for other in (board, snapshot):
+                    self.assertEqual(other.piece_counts, fresh.piece_counts)
+                    self.assertEqual(other.material, fresh.material)
+                    self.assertEqual(other.mailbox, fresh.mailbox)
+                    self.assertEqual(other.psq_score, fresh.psq_score)
+
+    def test_piece_count(self):
+        self.assertEqual(Board().piece_count(), [[8, 2, 2, 2, 1, 1], [8, 2, 2, 2, 1, 1]])
+        self.assertEqual(Board().material, [4000, 4000])
+        self.assertEqual(Board().psq_score, 0)
+
+    def test_insufficient_material(self):
+        for fen, expected in [('8/8/8/8/8/8/8/KBk5 w - - 0 1', True), ('8/8/8/8/8/8/8/KNk5 w - - 0 1', True),
+                              ('8/8/8/8/8/8/8/K1k5 w - - 0 1', True), ('8/8/8/8/8/8/8/KRk5 w - - 0 1', False),
+                              ('8/8/8/8/8/8/P7/K1k5 w - - 0 1', False), ('8/8/8/8/8/8/8/KBkb4 w - - 0 1', False)]:
+            with self.subTest(fen=fen):
+                self.assertEqual(Board(fen).is_insufficient_material(), expected)
+
+if __name__ == '__main__':
+    unittest.main()
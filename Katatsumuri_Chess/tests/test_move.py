@@ -0,0 +1,65 @@
+"""
+This file is part of Katatsumuri_Chess
+
+Copyright (c) 2022 YuaHyodo
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+import unittest
+
+from Katatsumuri_Chess import (Board, encode_move, int_to_uci, move_from_sq, move_to_sq, move_flag, move_promotion,
+                               SQUARE_INDEX, NORMAL, PROMOTION, EN_PASSANT, CASTLING, KNIGHT, QUEEN, KING, PAWN)
+
+class MoveEncodingTest(unittest.TestCase):
+    def test_fields(self):
+        move = encode_move(SQUARE_INDEX['a7'], SQUARE_INDEX['a8'], QUEEN)
+        self.assertEqual(move_from_sq(move), SQUARE_INDEX['a7'])
+        self.assertEqual(move_to_sq(move), SQUARE_INDEX['a8'])
+        self.assertEqual(move_flag(move), PROMOTION)
+        self.assertEqual(move_promotion(move), QUEEN)
+        self.assertEqual(int_to_uci(move), 'a7a8q')
+        self.assertTrue(0 <= move < 1 << 16)
+
+    def test_parse_uci_sets_flags(self):
+        self.assertEqual(move_flag(Board('4k3/8/8/8/8/8/8/4K2R w K - 0 1').parse_uci('e1g1')), CASTLING)
+        self.assertEqual(move_flag(Board('4k3/8/8/3Pp3/8/8/8/4K3 w - e6 0 1').parse_uci('d5e6')), EN_PASSANT)
+        self.assertEqual(move_flag(Board().parse_uci('e2e4')), NORMAL)
+
+    def test_uci_round_trip(self):
+        board = Board('r3k2r/Pppp1ppp/1b3nbN/nP6/BBP1P3/q4N2/Pp1P2PP/R2Q1RK1 b kq - 0 1')
+        for move in board.generate_legal_moves():
+            self.assertEqual(board.parse_uci(int_to_uci(move)), move)
+
+    def test_invalid_promotion(self):
+        board = Board('8/P6k/8/8/8/8/8/K7 w - - 0 1')
+        for uci in ('a7a8k', 'a7a8p', 'a7a8x'):
+            with self.subTest(uci=uci):
+                self.assertFalse(board.is_legal(uci))
+                with self.assertRaises(ValueError):
+                    board.push(uci)
+        for promotion in (PAWN, KING):
+            with self.assertRaises(ValueError):
+                encode_move(8, 0, promotion)
+        self.assertTrue(board.is_legal('a7a8n'))
+        board.push('a7a8n')
+        self.assertEqual(board.return_fen(), 'N7/7k/8/8/8/8/8/K7 b - - 0 1')
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,56 @@
+"""
+This file is part of Katatsumuri_Chess
+
+Copyright (c) 2022 YuaHyodo
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+import unittest
+
+from Katatsumuri_Chess import Board
+from Katatsumuri_Chess.bench import POSITIONS
+
+class PerftParallelTest(unittest.TestCase):
+    def test_matches_perft_divide(self):
+        for name, fen, _ in POSITIONS:
+            board = Board(fen)
+            divide = board.perft_divide(3)
+            for workers, split_depth in [(1, 1), (1, 2), (2, 1), (2, 2)]:
+                with self.subTest(name=name, workers=workers, split_depth=split_depth):
+                    total, result = board.perft_parallel(3, workers, split_depth)
+                    self.assertEqual(result, divide)
+                    self.assertEqual(total, sum(divide.values()))
+            self.assertEqual(board.return_fen(), fen)
+
+    def test_table_size(self):
+        board = Board()
+        self.assertEqual(board.perft_parallel(4, 1, 2, table_size=1 << 12)[1], board.perft_divide(4))
+
+    def test_shallow_depths(self):
+        board = Board()
+        self.assertEqual(board.perft_parallel(0, 1), (1, {}))
+        total, divide = board.perft_parallel(1, 1)
+        self.assertEqual(total, 20)
+        self.assertEqual(divide, board.perft_divide(1))
+        mated = Board('R5k1/5ppp/8/8/8/8/8/6K1 b - - 0 1')
+        self.assertEqual(mated.perft_parallel(3, 2), (0, {}))
+
+if __name__ == '__main__':
+    unittest.main()
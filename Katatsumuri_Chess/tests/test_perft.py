@@ -0,0 +1,53 @@
+"""
+This file is part of Katatsumuri_Chess
+
+Copyright (c) 2022 YuaHyodo
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+import unittest
+
+from Katatsumuri_Chess import Board, PerftTable
+from Katatsumuri_Chess.bench import POSITIONS
+
+class PerftTest(unittest.TestCase):
+    def test_reference_positions(self):
+        for name, fen, counts in POSITIONS:
+            board = Board(fen)
+            for depth in range(1, 4):
+                with self.subTest(name=name, depth=depth):
+                    self.assertEqual(board.perft(depth), counts[depth - 1])
+            self.assertEqual(board.return_fen(), fen)
+
+    def test_perft_divide_sums_to_perft(self):
+        board = Board(POSITIONS[1][1])
+        divide = board.perft_divide(2)
+        self.assertEqual(len(divide), POSITIONS[1][2][0])
+        self.assertEqual(sum(divide.values()), POSITIONS[1][2][1])
+
+    def test_perft_with_table(self):
+        board = Board(POSITIONS[0][1])
+        table = PerftTable(1 << 12)
+        self.assertEqual(board.perft(4, table), POSITIONS[0][2][3])
+        self.assertEqual(board.perft(4, table), POSITIONS[0][2][3])
+        self.assertGreater(table.hits, 0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,114 @@
+"""
+This file is part of Katatsumuri_Chess
+
+Copyright (c) 2022 YuaHyodo
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+import io
+import unittest
+
+from Katatsumuri_Chess import Board, int_to_uci
+from Katatsumuri_Chess.pgn import parse_san, read_games, replay, replay_games
+
+PGN = '''[Event "Opera"]
+[White "Morphy"]
+[Result "1-0"]
+
+1. e4 e5 2. Nf3 d6 {a comment
+[%clk 0:01] spanning lines} 3. d4 Bg4 $2 4. dxe5 (4. c3 Nf6 (4... a6) 5. h3) Bxf3
+5. Qxf3 dxe5 6. Bc4 Nf6 7. Qb3 Qe7 8. Nc3 c6 9. Bg5 b5?! 10. Nxb5 cxb5 11. Bxb5+ Nbd7
+12. O-O-O Rd8 13. Rxd7 Rxd7 14. Rd1 Qe6 ; a line comment
+15. Bxd7+ Nxd7 16. Qb8+ Nxb8 17. Rd8# 1-0
+
+[Event "Setup"]
+[FEN "4k3/1P6/8/8/3p4/8/4P3/4K2R w K - 0 1"]
+[SetUp "1"]
+
+1. e4 dxe3 2. b8=Q+ Kd7 3. 0-0 e2 4. Rf7+ Kc6 5. Rf8 e1=N *
+'''
+
+class SanTest(unittest.TestCase):
+    def test_disambiguation(self):
+        board = Board('4k3/8/8/8/8/2N3N1/8/R3K2R w KQ - 0 1')
+        self.assertEqual(int_to_uci(parse_san(board, 'Nce4')), 'c3e4')
+        self.assertEqual(int_to_uci(parse_san(board, 'Nge4')), 'g3e4')
+        self.assertEqual(int_to_uci(parse_san(board, 'Rad1')), 'a1d1')
+        self.assertEqual(int_to_uci(parse_san(board, 'Kd2+')), 'e1d2')
+        with self.assertRaises(ValueError):
+            parse_san(board, 'Ne4')
+        with self.assertRaises(ValueError):
+            parse_san(board, 'Qd1')
+        with self.assertRaises(ValueError):
+            parse_san(board, 'zz')
+
+    def test_castling(self):
+        board = Board('r3k2r/8/8/8/8/8/8/R3K2R w KQkq - 0 1')
+        self.assertEqual(int_to_uci(parse_san(board, 'O-O')), 'e1g1')
+        self.assertEqual(int_to_uci(parse_san(board, 'O-O-O')), 'e1c1')
+        self.assertEqual(int_to_uci(parse_san(board, '0-0')), 'e1g1')
+        board.push('e1g1')
+        self.assertEqual(int_to_uci(parse_san(board, 'O-O-O+')), 'e8c8')
+        with self.assertRaises(ValueError):
+            parse_san(Board('4k3/8/8/8/8/8/8/4K2R w - - 0 1'), 'O-O')
+
+    def test_promotion_and_en_passant(self):
+        board = Board('4k3/1P6/8/8/3pP3/8/8/4K3 b - e3 0 1')
+        self.assertEqual(int_to_uci(parse_san(board, 'dxe3')), 'd4e3')
+        board.push('e8d7')
+        self.assertEqual(int_to_uci(parse_san(board, 'b8=N')), 'b7b8n')
+        self.assertEqual(int_to_uci(parse_san(board, 'b8Q')), 'b7b8q')
+
+class PgnTest(unittest.TestCase):
+    def test_read_games(self):
+        games = list(read_games(io.StringIO(PGN)))
+        self.assertEqual(len(games), 2)
+        self.assertEqual(games[0].headers['White'], 'Morphy')
+        self.assertEqual(games[0].result, '1-0')
+        self.assertEqual(len(games[0].moves), 33)
+        self.assertEqual(games[0].moves[:4], ['e4', 'e5', 'Nf3', 'd6'])
+        self.assertEqual(games[1].result, '*')
+
+    def test_replay(self):
+        games = list(read_games(io.StringIO(PGN)))
+        for move, board in replay(games[0]):
+            pass
+        self.assertTrue(board.is_checkmate())
+        self.assertEqual(board.return_fen(), '1n1Rkb1r/p4ppp/4q3/4p1B1/4P3/8/PPP2PPP/2K5 b k - 1 17')
+        for move, board in replay(games[1]):
+            pass
+        self.assertEqual(board.return_fen(), '1Q3R2/8/2k5/8/8/8/8/4n1K1 w - - 0 6')
+
+    def test_replay_games(self):
+        plies = []
+        count = replay_games(io.StringIO(PGN), lambda game, move, board: plies.append(int_to_uci(move)))
+        self.assertEqual(count, 2)
+        self.assertEqual(len(plies), 33 + 10)
+        self.assertIn('e1g1', plies)
+        self.assertEqual(plies[-1], 'e2e1n')
+
+    def test_invalid_game(self):
+        source = '[Event "Bad"]\n\n1. e4 e5 2. Ke3 *\n\n' + PGN
+        with self.assertRaises(ValueError):
+            replay_games(io.StringIO(source), lambda game, move, board: None)
+        self.assertEqual(replay_games(io.StringIO(source), lambda game, move, board: None, skip_invalid=True), 2)
+
+if __name__ == '__main__':
+    unittest.main()
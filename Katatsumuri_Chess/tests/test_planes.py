@@ -0,0 +1,69 @@
+"""
+This file is part of Katatsumuri_Chess
+
+Copyright (c) 2022 YuaHyodo
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+import unittest
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+from Katatsumuri_Chess import Board, boards_to_planes, FEATURE_NAMES
+from Katatsumuri_Chess.bench import POSITIONS
+
+@unittest.skipIf(numpy == None, 'numpy is not installed')
+class PlanesTest(unittest.TestCase):
+    def test_planes_match_squares(self):
+        boards = [Board(fen) for _, fen, _ in POSITIONS]
+        planes, features = boards_to_planes(boards)
+        self.assertEqual(planes.shape, (len(boards), 12, 8, 8))
+        self.assertEqual(features.shape, (len(boards), len(FEATURE_NAMES)))
+        for n, board in enumerate(boards):
+            for sq in range(64):
+                code = board.piece_code_at(sq)
+                column = planes[n, :, sq // 8, sq % 8]
+                if code == None:
+                    self.assertEqual(int(column.sum()), 0)
+                else:
+                    self.assertEqual(list(numpy.nonzero(column)[0]), [code])
+
+    def test_features(self):
+        board = Board('4k2r/8/8/3Pp3/8/8/8/R3K3 w Qk e6 0 1')
+        planes, features = board.to_planes()
+        self.assertEqual(planes.shape, (12, 8, 8))
+        self.assertEqual(list(features), [0, 0, 1, 1, 0, 5])
+
+    def test_preallocated_buffers(self):
+        boards = [Board(), Board(POSITIONS[1][1])]
+        out = numpy.zeros((2, 12, 8, 8), dtype=numpy.uint8)
+        features_out = numpy.zeros((2, 6), dtype=numpy.uint8)
+        planes, features = boards_to_planes(boards, out, features_out)
+        self.assertIs(planes, out)
+        self.assertIs(features, features_out)
+        self.assertEqual(int(out[1].sum()), bin(boards[1].occupied).count('1'))
+        with self.assertRaises(ValueError):
+            boards_to_planes(boards, numpy.zeros((3, 12, 8, 8), dtype=numpy.uint8))
+
+if __name__ == '__main__':
+    unittest.main()
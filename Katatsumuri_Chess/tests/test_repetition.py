@@ -0,0 +1,66 @@
+"""
+This file is part of Katatsumuri_Chess
+
+Copyright (c) 2022 YuaHyodo
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+import unittest
+
+from Katatsumuri_Chess import Board
+
+class RepetitionTest(unittest.TestCase):
+    def test_threefold_and_fivefold(self):
+        board = Board()
+        self.assertFalse(board.is_threefold_repetition())
+        for i in range(2):
+            for move in ('g1f3', 'g8f6', 'f3g1', 'f6g8'):
+                board.push(move)
+        self.assertTrue(board.is_threefold_repetition())
+        self.assertFalse(board.is_fivefold_repetition())
+        self.assertTrue(board.is_draw())
+        for i in range(2):
+            for move in ('g1f3', 'g8f6', 'f3g1', 'f6g8'):
+                board.push(move)
+        self.assertTrue(board.is_fivefold_repetition())
+        board.pop()
+        self.assertFalse(board.is_fivefold_repetition())
+
+    def test_irreversible_move_resets_repetition(self):
+        board = Board()
+        for move in ('g1f3', 'g8f6', 'f3g1', 'f6g8', 'e2e4', 'e7e5'):
+            board.push(move)
+        for move in ('g1f3', 'g8f6', 'f3g1', 'f6g8'):
+            board.push(move)
+        self.assertEqual(board.repetition_count(), 2)
+        self.assertFalse(board.is_threefold_repetition())
+
+    def test_outcome_reports_repetition(self):
+        board = Board()
+        for i in range(2):
+            for move in ('g1f3', 'g8f6', 'f3g1', 'f6g8'):
+                board.push(move)
+        outcome = board.outcome()
+        self.assertTrue(outcome.repetition)
+        self.assertFalse(outcome.fivefold_repetition)
+        self.assertEqual(outcome.winner, None)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,65 @@
+"""
+This file is part of Katatsumuri_Chess
+
+Copyright (c) 2022 YuaHyodo
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+import random
+import unittest
+
+from Katatsumuri_Chess import Board, int_to_uci, FLAG_MASK, NORMAL, PROMOTION, EN_PASSANT, CASTLING
+from Katatsumuri_Chess.bench import POSITIONS
+
+class StagedMovesTest(unittest.TestCase):
+    def test_staged_moves_match_legal_moves(self):
+        rng = random.Random(1)
+        for name, fen, _ in POSITIONS:
+            board = Board(fen)
+            for ply in range(40):
+                moves = board.generate_legal_moves()
+                self.assertEqual(sorted(board.generate_staged_moves()), sorted(moves), board.return_fen())
+                self.assertEqual(board.has_legal_moves(), len(moves) != 0)
+                if len(moves) == 0:
+                    break
+                board.push_move(rng.choice(moves))
+
+    def test_stage_contents(self):
+        board = Board('r3k2r/Pppp1ppp/1b3nbN/nP6/BBP1P3/q4N2/Pp1P2PP/R2Q1RK1 b kq - 0 1')
+        captures = list(board.generate_staged_moves(True, False, False))
+        quiets = list(board.generate_staged_moves(False, True, False))
+        castling = list(board.generate_staged_moves(False, False, True))
+        for move in captures:
+            self.assertTrue(board.mailbox[move & 63] != None or move & FLAG_MASK in (PROMOTION, EN_PASSANT))
+        for move in quiets:
+            self.assertTrue(board.mailbox[move & 63] == None and move & FLAG_MASK == NORMAL)
+        self.assertEqual([move & FLAG_MASK for move in castling], [CASTLING])
+        #駒を取らない成りもcapturesに入る
+        self.assertIn('b2b1q', [int_to_uci(move) for move in captures])
+        self.assertEqual(list(board.generate_staged_moves())[:len(captures)], captures)
+
+    def test_mate_and_stalemate(self):
+        self.assertTrue(Board('k7/1Q6/2K5/8/8/8/8/8 b - - 0 1').is_checkmate())
+        self.assertTrue(Board('7k/5Q2/6K1/8/8/8/8/8 b - - 0 1').is_stalemate())
+        self.assertFalse(Board('6Qk/8/6K1/8/8/8/8/8 b - - 0 1').is_checkmate())
+        self.assertTrue(Board().has_legal_moves())
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,67 @@
+"""
+This file is part of Katatsumuri_Chess
+
+Copyright (c) 2022 YuaHyodo
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+import unittest
+
+from Katatsumuri_Chess import Board
+from Katatsumuri_Chess.batch import evaluate_chunk
+
+class StatsTest(unittest.TestCase):
+    def setUp(self):
+        self.original = Board.__dict__['legal_moves']
+        Board.stats.reset()
+
+    def tearDown(self):
+        Board.stats.disable()
+        Board.stats.reset()
+
+    def test_disabled_by_default(self):
+        self.assertFalse(Board.stats.enabled)
+        self.assertIs(Board.__dict__['legal_moves'], self.original)
+
+    def test_counts_calls_and_restores_methods(self):
+        board = Board()
+        with Board.stats:
+            self.assertIsNot(Board.__dict__['legal_moves'], self.original)
+            for i in range(3):
+                board.legal_moves()
+            board.set_fen('4k3/8/8/8/8/8/8/4K3 w - - 0 1')
+        self.assertIs(Board.__dict__['legal_moves'], self.original)
+        report = Board.stats.report()
+        self.assertEqual(report['legal_moves']['calls'], 3)
+        self.assertEqual(report['set_fen']['calls'], 1)
+        self.assertEqual(report['set_fen']['max_fen'], '4k3/8/8/8/8/8/8/4K3 w - - 0 1')
+        self.assertEqual(report['is_legal']['calls'], 0)
+        board.legal_moves()
+        self.assertEqual(Board.stats.report()['legal_moves']['calls'], 3)
+
+    def test_exception_is_not_replaced(self):
+        with Board.stats:
+            with self.assertRaises(ValueError):
+                Board('garbage')
+            self.assertEqual(evaluate_chunk(['garbage'])[0].legal_moves, None)
+        self.assertEqual(Board.stats.report()['set_fen']['calls'], 2)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,93 @@
+"""
+This file is part of Katatsumuri_Chess
+
+Copyright (c) 2022 YuaHyodo
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+import io
+import unittest
+
+from Katatsumuri_Chess.uci import UCI
+
+class UCITest(unittest.TestCase):
+    def setUp(self):
+        self.output = io.StringIO()
+        self.uci = UCI(self.output)
+
+    def tearDown(self):
+        self.uci.handle('quit')
+
+    def lines(self):
+        return self.output.getvalue().splitlines()
+
+    def test_handshake(self):
+        self.uci.handle('uci')
+        self.uci.handle('isready')
+        self.assertEqual(self.lines()[-2:], ['uciok', 'readyok'])
+
+    def test_position_reuses_common_prefix(self):
+        self.uci.handle('position startpos moves e2e4 e7e5 g1f3')
+        undo_stack = self.uci.board.undo_stack[:2]
+        self.uci.handle('position startpos moves e2e4 e7e5 b1c3')
+        self.assertEqual(self.uci.board.undo_stack[:2], undo_stack)
+        self.assertEqual(self.uci.moves, ['e2e4', 'e7e5', 'b1c3'])
+        self.assertEqual(self.uci.board.return_fen(), 'rnbqkbnr/pppp1ppp/8/4p3/4P3/2N5/PPPP1PPP/R1BQKBNR b KQkq - 1 2')
+        self.uci.handle('position startpos moves d2d4')
+        self.assertEqual(self.uci.board.return_fen(), 'rnbqkbnr/pppppppp/8/8/3P4/8/PPP1PPPP/RNBQKBNR b KQkq d3 0 1')
+
+    def test_position_fen(self):
+        self.uci.handle('position fen 4k3/8/8/8/8/8/8/4K2R w K - 0 1 moves e1g1')
+        self.assertEqual(self.uci.board.return_fen(), '4k3/8/8/8/8/8/8/5RK1 b - - 1 1')
+
+    def assertInvalid(self, command, fen, moves):
+        self.uci.handle(command)
+        self.assertTrue(self.lines()[-1].startswith('info string invalid move'))
+        self.assertEqual(self.uci.board.return_fen(), fen)
+        self.assertEqual(self.uci.moves, moves)
+        self.assertEqual(len(self.uci.board.undo_stack), len(moves))
+
+    def test_move_from_empty_square(self):
+        self.assertInvalid('position startpos moves e3e4', 'rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1', [])
+
+    def test_castling_without_rook(self):
+        self.assertInvalid('position fen 4k3/8/8/8/8/8/8/4K3 w - - 0 1 moves e1g1', '4k3/8/8/8/8/8/8/4K3 w - - 0 1', [])
+
+    def test_promotion_by_non_pawn(self):
+        self.assertInvalid('position startpos moves e2e4 e7e5 e1e2q',
+                           'rnbqkbnr/pppp1ppp/8/4p3/4P3/8/PPPP1PPP/RNBQKBNR w KQkq e6 0 2', ['e2e4', 'e7e5'])
+
+    def test_go_depth(self):
+        self.uci.handle('position fen 6k1/5ppp/8/8/8/8/8/R5K1 w - - 0 1')
+        self.uci.handle('go depth 3')
+        self.uci.thread.join()
+        self.assertEqual(self.lines()[-1], 'bestmove a1a8')
+        self.assertIn('score mate 1', self.lines()[-2])
+
+    def test_go_infinite_waits_for_stop(self):
+        self.uci.handle('go infinite')
+        self.uci.handle('isready')
+        self.assertIn('readyok', self.lines())
+        self.uci.handle('stop')
+        self.assertTrue(self.lines()[-1].startswith('bestmove '))
+        self.assertEqual(sum(line.startswith('bestmove') for line in self.lines()), 1)
+
+if __name__ == '__main__':
+    unittest.main()
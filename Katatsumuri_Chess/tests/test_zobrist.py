@@ -0,0 +1,63 @@
+"""
+This file is part of Katatsumuri_Chess
+
+Copyright (c) 2022 YuaHyodo
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+import random
+import unittest
+
+from Katatsumuri_Chess import Board
+from Katatsumuri_Chess.bench import POSITIONS
+
+class ZobristTest(unittest.TestCase):
+    def test_incremental_key_matches_full_computation(self):
+        rng = random.Random(2)
+        for name, fen, _ in POSITIONS:
+            for game in range(10):
+                board = Board(fen)
+                for ply in range(60):
+                    moves = board.generate_legal_moves()
+                    if len(moves) == 0:
+                        break
+                    board.push_move(rng.choice(moves))
+                    self.assertEqual(board.zobrist_key, board.compute_zobrist(), name)
+                    self.assertEqual(board.zobrist_key, Board(board.return_fen()).zobrist_key, name)
+
+    def test_transposition_has_same_key(self):
+        a = Board()
+        for move in ('g1f3', 'g8f6', 'b1c3'):
+            a.push(move)
+        b = Board()
+        for move in ('b1c3', 'g8f6', 'g1f3'):
+            b.push(move)
+        self.assertEqual(a.zobrist_key, b.zobrist_key)
+
+    def test_key_depends_on_turn_castling_and_en_passant(self):
+        keys = {Board(fen).zobrist() for fen in ['4k2r/8/8/8/8/8/8/4K3 w - - 0 1', '4k2r/8/8/8/8/8/8/4K3 b - - 0 1',
+                                                 '4k2r/8/8/8/8/8/8/4K3 w k - 0 1']}
+        self.assertEqual(len(keys), 3)
+        #取れないアンパッサンのマスはハッシュ値に含めない
+        self.assertEqual(Board('4k3/8/8/4p3/8/8/8/4K3 w - e6 0 1').zobrist(), Board('4k3/8/8/4p3/8/8/8/4K3 w - - 0 1').zobrist())
+        self.assertNotEqual(Board('4k3/8/8/3Pp3/8/8/8/4K3 w - e6 0 1').zobrist(), Board('4k3/8/8/3Pp3/8/8/8/4K3 w - - 0 1').zobrist())
+
+if __name__ == '__main__':
+    unittest.main()